@@ -1,4 +1,4 @@
 from .types import Jug, JugAction
 from .game import JugRiddle
-from .solver import solve
+from .solver import SOLVER_VERSION, solve
 from .exceptions import *
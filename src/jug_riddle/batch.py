@@ -0,0 +1,200 @@
+"""
+Solve lots of riddles in one pass.
+
+The input is a stream of lines, each one describing a riddle, either as NDJSON
+(`{"jug1_capacity": 4, "jug2_capacity": 3, "goal": 2}` or `[4, 3, 2]`) or as CSV (`4,3,2`).
+Lines are sent in chunks to a pool of worker processes and the results are yielded back in the
+same order as the input. Only a bounded number of chunks is in flight at any given time, so
+memory usage does not depend on the size of the input.
+"""
+import csv
+import json
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Iterable, Iterator
+
+from .exceptions import UnsolvableRiddle
+from .game import JugRiddle
+from .solver import solve
+
+NDJSON = "ndjson"
+CSV = "csv"
+FORMATS = (NDJSON, CSV)
+
+FIELDS = ("jug1_capacity", "jug2_capacity", "goal")
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def solve_triple(jug1_capacity: int, jug2_capacity: int, goal: int) -> dict:
+    """
+    Solves the given riddle and returns the result in the same shape as the `/solve` endpoint,
+    along with the riddle inputs so results can be matched with their riddle.
+    """
+    result = {"jug1_capacity": jug1_capacity, "jug2_capacity": jug2_capacity, "goal": goal}
+    try:
+        riddle = solve(JugRiddle(jug1_capacity, jug2_capacity, goal))
+    except UnsolvableRiddle:
+        result["response"] = "Unsolvable Riddle"
+        result["status"] = "Unsolvable"
+    else:
+        result["response"] = [
+            {"jug": jug.value, "action": action.name} for action, jug in riddle._actions
+        ]
+        result["status"] = "Solved"
+    return result
+
+
+def parse_line(line: str, fmt: str) -> tuple[int, int, int]:
+    """Parses a single NDJSON or CSV line into a (jug1_capacity, jug2_capacity, goal) triple"""
+    if fmt == NDJSON:
+        record = json.loads(line)
+        if isinstance(record, dict):
+            values = [record.get(field) for field in FIELDS]
+        else:
+            values = list(record)
+    elif fmt == CSV:
+        values = next(csv.reader([line]))
+    else:
+        raise ValueError(f"Unknown format '{fmt}'")
+    if len(values) != 3:
+        raise ValueError(f"Expected 3 values, got {len(values)}")
+    if fmt == NDJSON:
+        # JSON numbers must be integers already: `int` would truncate 4.9 and accept true as 1
+        for value in values:
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise ValueError(f"Expected an integer, got {json.dumps(value)}")
+    jug1_capacity, jug2_capacity, goal = (int(value) for value in values)
+    return jug1_capacity, jug2_capacity, goal
+
+
+def solve_line(line: str, fmt: str) -> dict:
+    """Parses and solves a single line. Invalid lines are reported as an error, not raised."""
+    try:
+        return solve_triple(*parse_line(line, fmt))
+    except Exception as e:
+        return {"input": line, "error": str(e)}
+
+
+def solve_chunk(lines: list[str], fmt: str) -> list[dict]:
+    """Solves a chunk of lines. This is the unit of work sent to the worker processes."""
+    return [solve_line(line, fmt) for line in lines]
+
+
+def is_header(line: str, fmt: str) -> bool:
+    """Whether the given (first) line is a CSV header"""
+    return fmt == CSV and line.startswith(FIELDS[0])
+
+
+class LineChunker:
+    """
+    Groups the (non blank) lines into chunks, dropping the CSV header if there is one.
+    Lines are added one at a time, so lines can be chunked as they are read (see `_chunks`).
+
+    Args:
+        fmt (str): Either "ndjson" or "csv".
+        chunk_size (int): How many lines per chunk. Must be at least 1.
+    """
+
+    def __init__(self, fmt: str, chunk_size: int):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+        self.chunk = []
+        self.first = True
+
+    def add(self, line: str) -> list[str] | None:
+        """Adds a line. Returns the chunk once it is full"""
+        line = line.strip()
+        if not line:
+            return None
+        if self.first:
+            self.first = False
+            if is_header(line, self.fmt):
+                return None
+        self.chunk.append(line)
+        if len(self.chunk) < self.chunk_size:
+            return None
+        chunk, self.chunk = self.chunk, []
+        return chunk
+
+    def flush(self) -> list[str] | None:
+        """Returns the last (not full) chunk, if any"""
+        chunk, self.chunk = self.chunk, []
+        return chunk or None
+
+
+def _chunks(lines: Iterable[str], chunker: LineChunker) -> Iterator[list[str]]:
+    for line in lines:
+        chunk = chunker.add(line)
+        if chunk is not None:
+            yield chunk
+    chunk = chunker.flush()
+    if chunk is not None:
+        yield chunk
+
+
+def max_workers() -> int:
+    """Upper bound for the number of worker processes: one per CPU"""
+    return os.cpu_count() or 1
+
+
+def solve_lines(
+    lines: Iterable[str],
+    fmt: str = NDJSON,
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    executor: Executor | None = None,
+) -> Iterator[dict]:
+    """
+    Solves every riddle in `lines` and yields the results in input order.
+    Arguments are validated when called, not when the first result is consumed.
+
+    Args:
+        lines (Iterable[str]): Riddles, one per line, in the given format.
+        fmt (str): Either "ndjson" or "csv".
+        workers (int | None): Size of the process pool, clamped to [1, #CPUs]. Defaults to the number of CPUs.
+            With 1 worker, riddles are solved in the calling process.
+        chunk_size (int): How many lines are sent to a worker at once. Must be at least 1.
+        executor (Executor | None): An existing (shared) pool to solve the chunks in, instead of creating one.
+            `workers` then only bounds how many chunks of these lines are in the pool at once.
+
+    Raises:
+        ValueError: If the format is unknown or `chunk_size` is less than 1.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format '{fmt}'")
+    if workers is None:
+        workers = max_workers()
+    workers = min(max(workers, 1), max_workers())
+    chunks = _chunks(lines, LineChunker(fmt, chunk_size))
+
+    if executor is not None:
+        return _solve_in_pool(executor, chunks, fmt, max_pending=2 * workers)
+    if workers == 1:
+        return (result for chunk in chunks for result in solve_chunk(chunk, fmt))
+    return _solve_in_new_pool(chunks, fmt, workers)
+
+
+def _solve_in_new_pool(chunks: Iterator[list[str]], fmt: str, workers: int) -> Iterator[dict]:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from _solve_in_pool(executor, chunks, fmt, max_pending=2 * workers)
+
+
+def _solve_in_pool(
+    executor: Executor, chunks: Iterator[list[str]], fmt: str, max_pending: int
+) -> Iterator[dict]:
+    """Solves the chunks in the pool, with at most `max_pending` of them in flight"""
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(executor.submit(solve_chunk, chunk, fmt))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
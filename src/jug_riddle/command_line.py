@@ -1,4 +1,9 @@
+import argparse
+import json
+import sys
+
 from jug_riddle import Jug, JugAction, JugRiddle, UnsolvableRiddle, solve
+from jug_riddle.batch import DEFAULT_CHUNK_SIZE, FORMATS, NDJSON, solve_lines
 
 
 def get_inputs():
@@ -48,3 +53,46 @@ def play_water_jug_riddle(x: int, y: int, z: int) -> bool:
     print(f"YOU DID IT! (and it only took you {len(riddle)} actions)")
     print(riddle.view_solution())
     return True
+
+
+def positive_int(value: str) -> int:
+    """argparse type for arguments that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def batch_solve_water_jug_riddles(argv: list[str]) -> int:
+    """
+    Solves every riddle read from a file (or stdin) and writes one NDJSON result per riddle to
+    stdout, in input order.
+
+    Usage: batch [FILE] [--format ndjson|csv] [--workers N] [--chunk-size N]
+    """
+    parser = argparse.ArgumentParser(
+        prog="batch", description="Solve many Water Jug Riddles at once."
+    )
+    parser.add_argument(
+        "file",
+        nargs="?",
+        type=argparse.FileType("r"),
+        default=sys.stdin,
+        help="File with one riddle per line (default: stdin)",
+    )
+    parser.add_argument("--format", choices=FORMATS, default=NDJSON)
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=None,
+        help="Worker processes, at most one per CPU (default: #CPUs)",
+    )
+    parser.add_argument("--chunk-size", type=positive_int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    for result in solve_lines(
+        args.file, args.format, workers=args.workers, chunk_size=args.chunk_size
+    ):
+        sys.stdout.write(json.dumps(result) + "\n")
+    sys.stdout.flush()
+    return 0
@@ -0,0 +1,333 @@
+"""
+Differential verification of `solve` against an exhaustive search of the riddle state space.
+
+For every checked riddle (X, Y, Z):
+  * `solve` and the exhaustive search must agree on whether the riddle is solvable.
+  * The solution returned by `solve` is replayed on a fresh riddle, and must be valid and reach the goal.
+  * The solution must be as short as the shortest one found by the exhaustive search.
+
+With `--fast`, the solver's solution is instead computed and replayed with plain integers (see
+`verifier.solver_actions`), and `solve` itself only runs for one riddle every `--full-check-every`. It is
+an order of magnitude faster, but it checks a copy of the solver's algorithm rather than `solve` (nor
+`JugRiddle.take_action`) for most riddles.
+
+Riddles are either enumerated (every triple within the given bounds) or sampled at random, and checked
+by a pool of worker processes. The exhaustive search is done once per pair of jugs (X, Y), as a breadth
+first search from the initial state gives the minimum number of actions for every goal at once.
+
+Note the exhaustive search follows the solver contract (see `is_solvable`): a goal bigger than both jugs
+is considered unsolvable, even if it can be reached by filling both of them.
+
+Known issues can be left out of the check, so the harness can gate on everything else:
+  * `--skip-goal-zero`: a goal of 0 is reached with no actions at all, but the solver pours some water around.
+
+Usage (from the `src` directory):
+    python -m jug_riddle.differential --max-capacity 30 --skip-goal-zero
+    python -m jug_riddle.differential --max-capacity 500 --samples 100000 --seed 1
+    python -m jug_riddle.differential --max-capacity 2000 --samples 1000000 --fast --skip-goal-zero
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+
+from .exceptions import InvalidAction, UnsolvableRiddle
+from .game import JugRiddle
+from .solver import solve
+from .verifier import replay_packed, solver_actions
+
+# How many failures are kept per shard (and reported)
+MAX_FAILURES = 20
+
+# In fast mode, one every this many riddles is still checked with `solve` itself
+FULL_CHECK_EVERY = 100
+
+
+@dataclass
+class Failure:
+    """A riddle where `solve` disagrees with the exhaustive search"""
+
+    jug_1: int
+    jug_2: int
+    goal: int
+    reason: str
+
+    @property
+    def size(self) -> tuple[int, int, int, int]:
+        """Used to sort the failures, smaller (i.e. easier to debug) riddles first"""
+        return (self.jug_1 + self.jug_2 + self.goal, self.jug_1, self.jug_2, self.goal)
+
+
+def min_steps_by_total(jug_1: int, jug_2: int) -> dict[int, int]:
+    """
+    Breadth first search over all the states reachable with jugs of capacities `jug_1` and `jug_2`.
+    Returns the minimum number of actions needed to have each reachable total amount of water.
+    """
+    steps = {(0, 0): 0}
+    by_total = {0: 0}
+    queue = deque([(0, 0)])
+    while queue:
+        state = queue.popleft()
+        a, b = state
+        depth = steps[state] + 1
+        to_b = min(a, jug_2 - b)
+        to_a = min(b, jug_1 - a)
+        for next_state in (
+            (jug_1, b),  # Fill jug 1
+            (a, jug_2),  # Fill jug 2
+            (0, b),  # Empty jug 1
+            (a, 0),  # Empty jug 2
+            (a - to_b, b + to_b),  # Transfer from jug 1
+            (a + to_a, b - to_a),  # Transfer from jug 2
+        ):
+            if next_state not in steps:
+                steps[next_state] = depth
+                by_total.setdefault(next_state[0] + next_state[1], depth)
+                queue.append(next_state)
+    return by_total
+
+
+def replay(jug_1: int, jug_2: int, goal: int, actions) -> str | None:
+    """Replays the given actions on a fresh riddle. Returns why they are not a solution, if they are not"""
+    riddle = JugRiddle(jug_1, jug_2, goal)
+    for idx, (action, jug) in enumerate(actions):
+        try:
+            riddle.take_action(jug, action)
+        except InvalidAction as e:
+            return f"step {idx + 1} is invalid: {e}"
+    if not riddle.done:
+        return "solution does not reach the goal"
+    return None
+
+
+def check(
+    jug_1: int, jug_2: int, goal: int, min_steps: dict[int, int], fast: bool = False
+) -> Failure | None:
+    """
+    Checks `solve` for a single riddle, given the exhaustive search results for its jugs.
+    With `fast`, the integer copy of the solver (`verifier.solver_actions`) is checked instead.
+    """
+    expected = min_steps.get(goal) if goal <= max(jug_1, jug_2) else None
+    if fast:
+        actions = solver_actions(jug_1, jug_2, goal)
+        steps = None if actions is None else len(actions)
+    else:
+        try:
+            solution = solve(JugRiddle(jug_1, jug_2, goal))
+        except UnsolvableRiddle:
+            solution = None
+        except Exception as e:
+            return Failure(jug_1, jug_2, goal, f"solve raised {type(e).__name__}: {e}")
+        steps = None if solution is None else len(solution)
+
+    if steps is None:
+        if expected is not None:
+            return Failure(jug_1, jug_2, goal, f"unsolvable, but solvable in {expected} steps")
+        return None
+    if expected is None:
+        return Failure(jug_1, jug_2, goal, "solved, but unsolvable")
+    if fast:
+        reason = _replay_packed(jug_1, jug_2, goal, actions)
+    else:
+        reason = replay(jug_1, jug_2, goal, solution._actions)
+    if reason is not None:
+        return Failure(jug_1, jug_2, goal, reason)
+    if steps != expected:
+        return Failure(jug_1, jug_2, goal, f"solved in {steps} steps, but {expected} is the minimum")
+    return None
+
+
+def _replay_packed(jug_1: int, jug_2: int, goal: int, actions: bytes) -> str | None:
+    """Same as `replay`, for packed actions"""
+    invalid_idx, reason, total_water = replay_packed(jug_1, jug_2, actions)
+    if invalid_idx is not None:
+        return f"step {invalid_idx + 1} is invalid: {reason}"
+    if total_water != goal:
+        return "solution does not reach the goal"
+    return None
+
+
+def _check_riddles(riddles, fast: bool, full_check_every: int) -> tuple[int, int, list[Failure]]:
+    """
+    Checks the given riddles, which must be sorted by jugs so the exhaustive search is done once per pair.
+    Returns how many riddles were checked and failed, and the smallest failures.
+    """
+    checked = 0
+    failures = []
+    jugs, min_steps = None, None
+    for jug_1, jug_2, goal in riddles:
+        if jugs != (jug_1, jug_2):
+            jugs = (jug_1, jug_2)
+            min_steps = min_steps_by_total(jug_1, jug_2)
+        failure = check(
+            jug_1, jug_2, goal, min_steps, fast=fast and checked % full_check_every != 0
+        )
+        checked += 1
+        if failure is not None:
+            failures.append(failure)
+    failures.sort(key=lambda f: f.size)
+    return checked, len(failures), failures[:MAX_FAILURES]
+
+
+def _check_enumeration_shard(
+    jug_1: int, max_capacity: int, min_goal: int, max_goal: int, fast: bool, full_check_every: int
+):
+    """Checks every riddle with the given capacity for jug 1"""
+    return _check_riddles(
+        (
+            (jug_1, jug_2, goal)
+            for jug_2 in range(1, max_capacity + 1)
+            for goal in range(min_goal, max_goal + 1)
+        ),
+        fast,
+        full_check_every,
+    )
+
+
+def _check_sample_shard(
+    max_capacity: int,
+    min_goal: int,
+    max_goal: int,
+    size: int,
+    seed: str,
+    fast: bool,
+    full_check_every: int,
+):
+    """Checks `size` random riddles. Each shard has its own (reproducible) random generator"""
+    rnd = random.Random(seed)
+    riddles = [
+        (rnd.randint(1, max_capacity), rnd.randint(1, max_capacity), rnd.randint(min_goal, max_goal))
+        for _ in range(size)
+    ]
+    return _check_riddles(sorted(riddles), fast, full_check_every)
+
+
+def verify(
+    max_capacity: int,
+    max_goal: int | None = None,
+    samples: int | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+    shard_size: int = 10_000,
+    fast: bool = False,
+    full_check_every: int = FULL_CHECK_EVERY,
+    skip_goal_zero: bool = False,
+) -> dict:
+    """
+    Cross-checks `solve` against the exhaustive search.
+
+    Args:
+        max_capacity (int): Jug capacities go from 1 to `max_capacity`.
+        max_goal (int | None): Goals go from 0 to `max_goal`. Defaults to `max_capacity`.
+        samples (int | None): If given, only check this many random riddles instead of all of them.
+        seed (int): Seed for the random sampling.
+        workers (int | None): Size of the process pool. Defaults to the number of CPUs.
+        shard_size (int): How many sampled riddles are sent to a worker at once.
+        fast (bool): Check the integer copy of the solver instead of `solve` (see the module docstring).
+        full_check_every (int): In fast mode, one every this many riddles (per shard) is still checked
+            with `solve` itself.
+        skip_goal_zero (bool): Leave out riddles with a goal of 0 (a known issue, see the module docstring).
+
+    Returns:
+        dict: How many riddles were checked, and the smallest failing ones (if any).
+    """
+    if max_goal is None:
+        max_goal = max_capacity
+    if workers is None:
+        workers = os.cpu_count() or 1
+    min_goal = 1 if skip_goal_zero else 0
+
+    if samples is None:
+        shards = [
+            (
+                _check_enumeration_shard,
+                (jug_1, max_capacity, min_goal, max_goal, fast, full_check_every),
+            )
+            for jug_1 in range(1, max_capacity + 1)
+        ]
+    else:
+        shards = [
+            (
+                _check_sample_shard,
+                (
+                    max_capacity,
+                    min_goal,
+                    max_goal,
+                    min(shard_size, samples - start),
+                    f"{seed}:{start}",
+                    fast,
+                    full_check_every,
+                ),
+            )
+            for start in range(0, samples, shard_size)
+        ]
+
+    checked = 0
+    failed = 0
+    failures = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(function, *args) for function, args in shards]
+        for future in futures:
+            shard_checked, shard_failed, shard_failures = future.result()
+            checked += shard_checked
+            failed += shard_failed
+            failures.extend(shard_failures)
+    failures.sort(key=lambda f: f.size)
+    return {
+        "checked": checked,
+        "failed": failed,
+        "failures": [asdict(failure) for failure in failures[:MAX_FAILURES]],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m jug_riddle.differential",
+        description="Cross-check the solver against an exhaustive search.",
+    )
+    parser.add_argument("--max-capacity", type=int, required=True)
+    parser.add_argument("--max-goal", type=int, default=None)
+    parser.add_argument("--samples", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Check an integer copy of the solver, and run solve itself only for a sample",
+    )
+    parser.add_argument(
+        "--full-check-every",
+        type=int,
+        default=FULL_CHECK_EVERY,
+        help="With --fast, run solve itself for one every N riddles (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--skip-goal-zero",
+        action="store_true",
+        help="Leave out goal 0 (known issue: the solver takes actions where none are needed)",
+    )
+    args = parser.parse_args(argv)
+    if args.full_check_every < 1:
+        parser.error("--full-check-every must be at least 1")
+
+    report = verify(
+        args.max_capacity,
+        max_goal=args.max_goal,
+        samples=args.samples,
+        seed=args.seed,
+        workers=args.workers,
+        fast=args.fast,
+        full_check_every=args.full_check_every,
+        skip_goal_zero=args.skip_goal_zero,
+    )
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
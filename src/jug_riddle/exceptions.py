@@ -8,3 +8,9 @@ class UnsolvableRiddle(Exception):
     """
     Custom exception class to handle unsolvable riddles.
     """
+
+
+class SolveCancelled(Exception):
+    """
+    Custom exception class to abort an ongoing solve (e.g. from a progress callback).
+    """
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from typing import Final
 
 from .types import Jug, JugAction
-from .exceptions import InvalidAction
+from .exceptions import InvalidAction, SolveCancelled
 
 LOG = logging.getLogger(__name__)
 
@@ -48,6 +48,7 @@ class JugRiddle:
         goal (int): The target amount of water to achieve.
         _states (list[JugRiddleState]): List of riddle states during the simulation.
         _actions (list[tuple[JugAction, Jug]]): List of actions taken during the simulation.
+        _observers (list[RiddleObserver]): Observers notified of every action taken (see `add_observer`).
 
     Note:
         This class assumes that both jug capacities (jug_1 and jug_2) are positive integers,
@@ -68,6 +69,7 @@ class JugRiddle:
         self.goal: Final = goal
         self._states = [JugRiddleState(0, 0)]
         self._actions = []
+        self._observers = []
 
     def __str__(self):
         return (
@@ -185,6 +187,23 @@ class JugRiddle:
         )
 
 
+    def add_observer(self, observer):
+        """
+        Adds an observer (see `jug_riddle.observers.RiddleObserver`) to be notified of every action taken.
+        While there are observers, the riddle is an `ObservedJugRiddle`, whose `take_action` notifies
+        them, so riddles without observers pay nothing for this feature. Switching the class (rather
+        than shadowing `take_action` with a bound method) keeps the riddle free of reference cycles.
+        """
+        self._observers.append(observer)
+        if type(self) is JugRiddle:
+            self.__class__ = ObservedJugRiddle
+
+    def remove_observer(self, observer):
+        """Removes an observer previously added with `add_observer`"""
+        self._observers.remove(observer)
+        if not self._observers and type(self) is ObservedJugRiddle:
+            self.__class__ = JugRiddle
+
     def undo_last_action(self):
         """Useful when solving the riddle manually and a mistake was made and we want to 
         go back to a previous step"""
@@ -201,3 +220,21 @@ class JugRiddle:
                 for idx, (action, jug) in enumerate(self._actions)
             ]
         )
+
+
+class ObservedJugRiddle(JugRiddle):
+    """
+    A `JugRiddle` with observers (see `JugRiddle.add_observer`), notified of every action taken.
+    Exceptions raised by the observers are logged, except for `SolveCancelled`.
+    """
+
+    def take_action(self, jug: Jug, jug_action: JugAction):
+        super().take_action(jug, jug_action)
+        for observer in self._observers:
+            try:
+                observer.on_step(self, jug, jug_action)
+            except SolveCancelled:
+                raise
+            except Exception:
+                # A failing observer must not break the riddle (nor the solve) it observes
+                LOG.exception("Observer %r failed on step", observer)
@@ -0,0 +1,219 @@
+"""
+Hooks to observe what happens while a riddle is played or solved.
+
+An observer is notified of every step taken on a riddle (see `JugRiddle.add_observer`) and, when
+attached with `attach`, of every call to `solve` (start and end, and the strategies tried).
+
+Observers are free when not in use: `take_action` only notifies observers on the riddles that
+have an observer interested in steps, and `solve` only checks once per call whether there is
+someone to notify.
+"""
+import logging
+import sys
+import threading
+import time
+from typing import Callable, TextIO
+
+from .exceptions import SolveCancelled
+from .types import Jug, JugAction
+
+LOG = logging.getLogger(__name__)
+
+_attached = []
+
+
+class RiddleObserver:
+    """
+    Base class for observers. Every hook is a no-op, subclasses override the ones they need.
+    Only observers overriding `on_step` are hooked into the riddles being solved.
+    """
+
+    def on_solve_start(self, riddle) -> None:
+        """`solve` was called for `riddle`"""
+
+    def on_strategy_start(self, riddle, pouring_jug: Jug) -> None:
+        """`riddle` is about to be solved by always pouring from `pouring_jug`"""
+
+    def on_step(self, riddle, jug: Jug, jug_action: JugAction) -> None:
+        """`jug_action` was taken on `jug` of `riddle`"""
+
+    def on_strategy_end(self, riddle, pouring_jug: Jug) -> None:
+        """`riddle` was solved by always pouring from `pouring_jug`"""
+
+    def on_strategy_chosen(self, riddle, pouring_jug: Jug) -> None:
+        """`riddle`, solved by always pouring from `pouring_jug`, is the best solution"""
+
+    def on_solve_end(self, riddle, solution) -> None:
+        """
+        `solve` finished for `riddle`. `solution` is None if the riddle is unsolvable
+        or the solve was aborted.
+        """
+
+
+def observes_steps(observer: RiddleObserver) -> bool:
+    """
+    Whether the given observer wants to be notified of every step.
+    A `SampledObserver` does only if the observer it wraps does.
+    """
+    if isinstance(observer, SampledObserver):
+        return observes_steps(observer.observer)
+    return type(observer).on_step is not RiddleObserver.on_step
+
+
+def notify(observers: list[RiddleObserver], event: str, *args) -> None:
+    """
+    Calls the `event` hook (e.g. "on_solve_start") of every observer.
+    A failing hook is logged and does not stop the others (nor the solve), except for `SolveCancelled`.
+    """
+    for observer in observers:
+        try:
+            getattr(observer, event)(*args)
+        except SolveCancelled:
+            raise
+        except Exception:
+            LOG.exception("Observer %r failed on %s", observer, event)
+
+
+def attach(observer: RiddleObserver) -> None:
+    """Attaches an observer to every subsequent call to `solve`"""
+    _attached.append(observer)
+
+
+def detach(observer: RiddleObserver) -> None:
+    """Detaches an observer previously attached with `attach`"""
+    _attached.remove(observer)
+
+
+def attached() -> list[RiddleObserver]:
+    """Observers currently attached to `solve`"""
+    return list(_attached)
+
+
+class SampledObserver(RiddleObserver):
+    """
+    Forwards only one every `every` steps to `observer`. Other events are always forwarded.
+
+    Args:
+        observer (RiddleObserver): The observer to forward the events to.
+        every (int): Sampling rate of the steps.
+    """
+
+    def __init__(self, observer: RiddleObserver, every: int):
+        self.observer = observer
+        self.every = every
+        self.steps = 0
+
+    def on_solve_start(self, riddle):
+        self.observer.on_solve_start(riddle)
+
+    def on_strategy_start(self, riddle, pouring_jug):
+        self.observer.on_strategy_start(riddle, pouring_jug)
+
+    def on_step(self, riddle, jug, jug_action):
+        self.steps += 1
+        if self.steps % self.every == 0:
+            self.observer.on_step(riddle, jug, jug_action)
+
+    def on_strategy_end(self, riddle, pouring_jug):
+        self.observer.on_strategy_end(riddle, pouring_jug)
+
+    def on_strategy_chosen(self, riddle, pouring_jug):
+        self.observer.on_strategy_chosen(riddle, pouring_jug)
+
+    def on_solve_end(self, riddle, solution):
+        self.observer.on_solve_end(riddle, solution)
+
+
+class ProgressObserver(RiddleObserver):
+    """
+    Calls `progress` every `every` steps with the number of actions taken so far, adding up
+    all the strategies tried. This is how the `progress` argument of `solve` is implemented.
+
+    Args:
+        progress (Callable[[int], None]): The function to call.
+        every (int): How often (in steps) `progress` is called.
+    """
+
+    def __init__(self, progress: Callable[[int], None], every: int):
+        self.progress = progress
+        self.every = every
+        self.steps = 0
+        self.solved_steps = 0
+
+    def on_step(self, riddle, jug, jug_action):
+        self.steps += 1
+        if self.steps % self.every == 0:
+            self.progress(self.solved_steps + len(riddle))
+
+    def on_strategy_end(self, riddle, pouring_jug):
+        self.solved_steps += len(riddle)
+
+
+class ProfilerObserver(RiddleObserver):
+    """
+    Measures how long each phase of a solve takes (each strategy, and the whole solve) and
+    how many steps per second were taken, and writes a report to `stream` when the solve ends.
+    The last report is also kept in `report`. Solves running in different threads are profiled separately.
+
+    It does not observe steps, so it adds no per-step overhead.
+
+    Args:
+        stream (TextIO): Where to write the reports. Defaults to stderr.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream if stream is not None else sys.stderr
+        self.report = {}
+        # Attached observers are shared by every thread, so the solve in progress is kept per thread
+        self._local = threading.local()
+
+    def on_solve_start(self, riddle):
+        self._local.report = {
+            "riddle": (riddle.jug_1_capacity, riddle.jug_2_capacity, riddle.goal),
+            "phases": {},
+        }
+        self._local.started = {"solve": time.perf_counter()}
+
+    def on_strategy_start(self, riddle, pouring_jug):
+        self._local.started[pouring_jug.name] = time.perf_counter()
+
+    def on_strategy_end(self, riddle, pouring_jug):
+        self._end_phase(f"pour from {pouring_jug.name}", pouring_jug.name, len(riddle))
+
+    def on_strategy_chosen(self, riddle, pouring_jug):
+        self._local.report["strategy"] = f"pour from {pouring_jug.name}"
+
+    def on_solve_end(self, riddle, solution):
+        report = self._local.report
+        steps = sum(phase["steps"] for phase in report["phases"].values())
+        self._end_phase("solve", "solve", steps)
+        report["solution_steps"] = None if solution is None else len(solution)
+        self.report = report
+        self.stream.write(self.format_report(report) + "\n")
+
+    def _end_phase(self, name, started_key, steps):
+        elapsed = time.perf_counter() - self._local.started.pop(started_key)
+        self._local.report["phases"][name] = {
+            "seconds": elapsed,
+            "steps": steps,
+            "steps_per_second": steps / elapsed if elapsed else None,
+        }
+
+    def format_report(self, report: dict | None = None) -> str:
+        """Formats the given report (by default, the last one)"""
+        if report is None:
+            report = self.report
+        x, y, z = report["riddle"]
+        lines = [f"Solve profile for riddle ({x}, {y}, {z}):"]
+        for name, phase in report["phases"].items():
+            rate = phase["steps_per_second"]
+            rate = "-" if rate is None else f"{rate:.0f}"
+            lines.append(
+                f"  {name}: {phase['seconds'] * 1000:.3f} ms, "
+                f"{phase['steps']} steps ({rate} steps/s)"
+            )
+        lines.append(
+            f"  strategy chosen: {report.get('strategy')}, "
+            f"solution steps: {report['solution_steps']}"
+        )
+        return "\n".join(lines)
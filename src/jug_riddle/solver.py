@@ -10,11 +10,20 @@ The above equation is solvable iff gcd(X, Y) divides Z.
 
 """
 import math
+from typing import Callable
 
 from .exceptions import UnsolvableRiddle
 from .game import JugRiddle
+from .observers import ProgressObserver, RiddleObserver, attached, notify, observes_steps
 from .types import Jug, JugAction
 
+# Bump whenever a change to the algorithm may alter the sequence of actions returned by `solve`.
+# It is part of the HTTP cache validators, so cached solutions are invalidated with it.
+SOLVER_VERSION = "1"
+
+# How often (in steps) the progress callback of `solve` is called
+PROGRESS_INTERVAL = 1024
+
 
 def is_solvable(riddle: JugRiddle) -> bool:
     """Determines if the given riddle is solvable or not.
@@ -71,31 +80,68 @@ def __solve_riddle_by_always_poruing_from_one_jug(
                 riddle.take_action(pour_to_jug, JugAction.EMPTY)
 
 
-def solve(riddle: JugRiddle) -> JugRiddle:
+def __solve_with_strategy(
+    riddle: JugRiddle, pouring_jug: Jug, observers: list[RiddleObserver]
+) -> JugRiddle:
+    """
+    Solves a copy of the given riddle by always pouring from `pouring_jug`, notifying the observers.
+    Only the observers interested in steps are hooked into the riddle while it is being solved.
+    """
+    solution = JugRiddle(riddle.jug_1_capacity, riddle.jug_2_capacity, riddle.goal)
+    step_observers = [observer for observer in observers if observes_steps(observer)]
+    for observer in step_observers:
+        solution.add_observer(observer)
+    notify(observers, "on_strategy_start", solution, pouring_jug)
+    __solve_riddle_by_always_poruing_from_one_jug(solution, pouring_jug)
+    notify(observers, "on_strategy_end", solution, pouring_jug)
+    for observer in step_observers:
+        solution.remove_observer(observer)
+    return solution
+
+
+def solve(
+    riddle: JugRiddle, progress: Callable[[int], None] | None = None
+) -> JugRiddle:
     """
     Finds the set of states that will solve the given jug riddle in the most efficient way (i.e. with the minimum
     amount of actions) if any.
 
     If no solution exists, an exception is raised.
+
+    If given, `progress` is called every `PROGRESS_INTERVAL` steps with the number of actions taken so far (adding
+    up all the strategies tried). It may raise `SolveCancelled` to abort the solve.
+
+    Observers attached with `observers.attach` are notified of the solve, see `RiddleObserver`. An observer
+    raising an exception (other than `SolveCancelled`) is logged, it does not abort the solve.
     """
-    if not is_solvable(riddle):
-        # Riddle is not solvable.
-        raise UnsolvableRiddle("Riddle can't be solved!")
-
-    # To find the sequence of operations, the following algorithm is applied:
-    #  * Repeat until the desired amount of water is obtained:
-    #      – Fill one jug.
-    #      – Transfer water into the other jug. Whenever the second jug becomes full, empty it out.
-    # In order to know which sequence of actions is optimal (i.e. less number of actions taken), we will consider both
-    # possible scenarios:
-    #  1-  Always pour from jug 1 into jug 2
-    #  2-  Always pour from jug 2 into jug 1
-    # and check which reaches the solution in the minimum number of steps
-
-    riddle_1 = JugRiddle(riddle.jug_1_capacity, riddle.jug_2_capacity, riddle.goal)
-    __solve_riddle_by_always_poruing_from_one_jug(riddle_1, Jug.JUG_1)
-    riddle_2 = JugRiddle(riddle.jug_1_capacity, riddle.jug_2_capacity, riddle.goal)
-    __solve_riddle_by_always_poruing_from_one_jug(riddle_2, Jug.JUG_2)
-
-    sol = min(riddle_1, riddle_2, key=len)
+    observers = attached()
+    if progress is not None:
+        observers.append(ProgressObserver(progress, PROGRESS_INTERVAL))
+
+    notify(observers, "on_solve_start", riddle)
+    sol = None
+    try:
+        if not is_solvable(riddle):
+            # Riddle is not solvable.
+            raise UnsolvableRiddle("Riddle can't be solved!")
+
+        # To find the sequence of operations, the following algorithm is applied:
+        #  * Repeat until the desired amount of water is obtained:
+        #      – Fill one jug.
+        #      – Transfer water into the other jug. Whenever the second jug becomes full, empty it out.
+        # In order to know which sequence of actions is optimal (i.e. less number of actions taken), we will consider
+        # both possible scenarios:
+        #  1-  Always pour from jug 1 into jug 2
+        #  2-  Always pour from jug 2 into jug 1
+        # and check which reaches the solution in the minimum number of steps
+
+        riddle_1 = __solve_with_strategy(riddle, Jug.JUG_1, observers)
+        riddle_2 = __solve_with_strategy(riddle, Jug.JUG_2, observers)
+
+        sol, pouring_jug = min(
+            (riddle_1, Jug.JUG_1), (riddle_2, Jug.JUG_2), key=lambda s: len(s[0])
+        )
+        notify(observers, "on_strategy_chosen", sol, pouring_jug)
+    finally:
+        notify(observers, "on_solve_end", riddle, sol)
     return sol
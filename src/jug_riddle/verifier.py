@@ -0,0 +1,294 @@
+"""
+Fast verification of solutions submitted by players or external tools.
+
+Replaying a solution through `JugRiddle.take_action` keeps the whole history and validates each
+action by raising exceptions. Here, actions are packed as small integers (see `pack_actions`) and
+checked with a tight loop over two integers, and without keeping any history.
+
+The number of steps of the solver's solution is computed arithmetically (see `solver_steps`), so
+we can tell whether a submitted solution is optimal without solving the riddle with `solve`. It is
+only computed for solutions that reach the goal.
+"""
+import functools
+import math
+from dataclasses import dataclass
+
+from .types import Jug, JugAction
+
+# Packed action codes: one byte per action
+FILL_1, FILL_2, EMPTY_1, EMPTY_2, TRANSFER_1, TRANSFER_2 = range(6)
+
+
+def action_code(jug_action: JugAction, jug: Jug) -> int:
+    """Packed code of an action taken on a jug"""
+    return (jug_action.value - 1) * 2 + (jug.value - 1)
+
+
+def pack_actions(actions) -> bytes:
+    """Packs a list of actions, as `(JugAction, Jug)` tuples (e.g. `JugRiddle._actions`)"""
+    return bytes(action_code(jug_action, jug) for jug_action, jug in actions)
+
+
+def pack_json_actions(actions: list[dict]) -> bytes:
+    """
+    Packs a list of actions in the JSON format of the `/solve` endpoint, e.g.
+    `[{"jug": 1, "action": "FILL"}, {"jug": 1, "action": "TRANSFER"}]`.
+    Unknown actions are packed as an invalid code, so they are reported by `verify` as an invalid step.
+    """
+    codes = bytearray()
+    for action in actions:
+        try:
+            codes.append(action_code(JugAction[action["action"]], Jug(action["jug"])))
+        except (KeyError, TypeError, ValueError):
+            codes.append(255)
+    return bytes(codes)
+
+
+@dataclass
+class VerificationResult:
+    """
+    Outcome of the verification of a solution.
+
+    Attributes:
+        steps (int): Number of actions submitted.
+        valid (bool): Whether every action could be taken.
+        solved (bool): Whether the actions are valid and reach the goal.
+        first_invalid_step (int | None): 1-based index of the first action that could not be taken.
+        reason (str | None): Why the solution is not valid (or does not reach the goal).
+        solver_steps (int | None): Number of actions of the solver's solution. None if the solver has no
+            solution, or if the submitted one does not reach the goal.
+        optimal (bool | None): Whether the solution is solved in no more actions than the solver's.
+            None if the solver has no solution to compare with.
+    """
+
+    steps: int
+    valid: bool
+    solved: bool
+    first_invalid_step: int | None
+    reason: str | None
+    solver_steps: int | None
+    optimal: bool | None
+
+
+def _pour(jug_1: int, jug_2: int, goal: int, pouring_jug: Jug, codes: bytearray | None = None) -> int:
+    """
+    Number of actions taken by the solver when always pouring from `pouring_jug`, simulated action by action.
+    If given, the (packed) actions are appended to `codes`.
+    Mirrors `solver.__solve_riddle_by_always_poruing_from_one_jug`.
+    """
+    # Offsets of the pouring and the other jug in the action codes
+    p = pouring_jug.value - 1
+    o = 1 - p
+    pouring, other = (jug_1, jug_2) if p == 0 else (jug_2, jug_1)
+    # Start by filling the "from" jug
+    a, b, steps = pouring, 0, 1
+    if codes is not None:
+        codes.append(FILL_1 + p)
+    while a + b != goal:
+        # Transfer from the pouring jug into the other jug
+        water = min(a, other - b)
+        a, b = a - water, b + water
+        steps += 1
+        if codes is not None:
+            codes.append(TRANSFER_1 + p)
+        if a == goal or b == goal:
+            # Almost done, empty jug 2 if jug 1 has the goal, or jug 1 otherwise (if needed)
+            if a + b != goal:
+                emptied = 1 if (a if p == 0 else b) == goal else 0
+                if emptied == p:
+                    a = 0
+                else:
+                    b = 0
+                steps += 1
+                if codes is not None:
+                    codes.append(EMPTY_1 + emptied)
+        else:
+            if a == 0:
+                a = pouring
+                steps += 1
+                if codes is not None:
+                    codes.append(FILL_1 + p)
+            if b == other:
+                b = 0
+                steps += 1
+                if codes is not None:
+                    codes.append(EMPTY_1 + o)
+    return steps
+
+
+def _first_multiple(step: int, target: int, modulus: int) -> int | None:
+    """Smallest k >= 1 such that k * step = target (mod modulus), or None if there is none"""
+    d = math.gcd(step, modulus)
+    if target % d:
+        return None
+    m = modulus // d
+    k = (target // d) * pow(step // d, -1, m) % m
+    return k or m
+
+
+def _pour_steps(pouring: int, other: int, goal: int) -> int:
+    """
+    Same as `_pour` (from a jug of capacity `pouring` into one of capacity `other`), in constant time.
+
+    Let C be the water transferred into the other jug so far. A transfer stops when the pouring jug is
+    empty (C is a multiple of `pouring`, and the jug is filled again) or the other one is full (C is a
+    multiple of `other`, and it is emptied). The solve ends at the first such C where one of the jugs
+    has the goal, or where filling the pouring jug again makes the total the goal. The number of actions
+    then follows from how many multiples of each capacity there are up to C.
+    Only valid for positive capacities and goals the solver can reach.
+    """
+    if pouring == goal:
+        return 1
+    # (C, actions after the last transfer) of each way of reaching the goal
+    ends = []
+    if goal == 0:
+        # The pouring jug is empty after the first transfer, the other jug is emptied
+        ends.append((pouring, 1))
+    if 1 <= goal <= other:
+        # The other jug has the goal just as the pouring jug is empty
+        k = _first_multiple(pouring, goal % other, other)
+        if k is not None:
+            ends.append((k * pouring, 0))
+    if 0 < goal - pouring < other:
+        # The pouring jug is empty, and filling it makes the goal
+        k = _first_multiple(pouring, goal - pouring, other)
+        if k is not None:
+            ends.append((k * pouring, 1))
+    if 0 < goal < pouring:
+        # The pouring jug is left with the goal as the other jug is full, which is emptied
+        k = _first_multiple(other, -goal % pouring, pouring)
+        if k is not None:
+            ends.append((k * other, 1))
+    if goal == other:
+        # The other jug is full with the goal, the pouring jug is emptied (if needed)
+        ends.append((other, 0 if other % pouring == 0 else 1))
+    c, last = min(ends)
+    lcm = pouring * other // math.gcd(pouring, other)
+    transfers = c // pouring + c // other - c // lcm
+    # Refills and empties after every transfer but the last one
+    fills = -(-c // pouring) - 1
+    empties = -(-c // other) - 1
+    return 1 + transfers + fills + empties + last
+
+
+def is_solvable(jug_1: int, jug_2: int, goal: int) -> bool:
+    """Same as `solver.is_solvable`, without building a riddle"""
+    return goal <= max(jug_1, jug_2) and goal % math.gcd(jug_1, jug_2) == 0
+
+
+@functools.lru_cache(maxsize=1024)
+def solver_steps(jug_1: int, jug_2: int, goal: int) -> int | None:
+    """
+    Number of actions of the solution `solve` finds for the riddle, or None if it has none (it is
+    unsolvable, or a jug has no capacity). Computed in constant time, without solving the riddle.
+    Results are cached, as the same riddle is usually verified over and over.
+    """
+    if jug_1 <= 0 or jug_2 <= 0 or not is_solvable(jug_1, jug_2, goal):
+        return None
+    return min(_pour_steps(jug_1, jug_2, goal), _pour_steps(jug_2, jug_1, goal))
+
+
+def solver_actions(jug_1: int, jug_2: int, goal: int) -> bytes | None:
+    """
+    Packed actions of the solution `solve` finds for the riddle, or None if it is unsolvable.
+    Same solution as `solve`, without building (and validating) a `JugRiddle` at every step.
+    """
+    if jug_1 <= 0 or jug_2 <= 0 or not is_solvable(jug_1, jug_2, goal):
+        return None
+    codes_1, codes_2 = bytearray(), bytearray()
+    _pour(jug_1, jug_2, goal, Jug.JUG_1, codes=codes_1)
+    _pour(jug_1, jug_2, goal, Jug.JUG_2, codes=codes_2)
+    # On a tie, `solve` keeps pouring from Jug 1
+    return bytes(codes_1 if len(codes_1) <= len(codes_2) else codes_2)
+
+
+def _invalid_reason(code: int, a: int, b: int) -> str:
+    """Why the action `code` can not be taken with `a` and `b` gallons in the jugs"""
+    if code in (FILL_1, FILL_2):
+        return "Trying to fill an already full jug!"
+    if code in (EMPTY_1, EMPTY_2):
+        return "Trying to empty an already empty jug!"
+    if code in (TRANSFER_1, TRANSFER_2):
+        if (a if code == TRANSFER_1 else b) == 0:
+            return "Transferring from empty jar!"
+        return "Transferring to full jar!"
+    return f"Unknown action code {code}"
+
+
+def replay_packed(jug_1: int, jug_2: int, codes) -> tuple[int | None, str | None, int]:
+    """Replays the actions. Returns the first invalid one (index and reason), and the final total water"""
+    a = b = 0
+    # Hot loop: transfers (the most common action) are checked first, and the reason of an invalid
+    # action is only worked out once the replay has stopped
+    for idx, code in enumerate(codes):
+        if code == TRANSFER_1:
+            if a == 0 or b == jug_2:
+                break
+            water = jug_2 - b
+            if a < water:
+                water = a
+            a -= water
+            b += water
+        elif code == TRANSFER_2:
+            if b == 0 or a == jug_1:
+                break
+            water = jug_1 - a
+            if b < water:
+                water = b
+            b -= water
+            a += water
+        elif code == FILL_1:
+            if a == jug_1:
+                break
+            a = jug_1
+        elif code == FILL_2:
+            if b == jug_2:
+                break
+            b = jug_2
+        elif code == EMPTY_1:
+            if a == 0:
+                break
+            a = 0
+        elif code == EMPTY_2:
+            if b == 0:
+                break
+            b = 0
+        else:
+            break
+    else:
+        return None, None, a + b
+    return idx, _invalid_reason(code, a, b), a + b
+
+
+def verify(jug_1: int, jug_2: int, goal: int, codes) -> VerificationResult:
+    """
+    Verifies a solution to the riddle (`jug_1`, `jug_2`, `goal`).
+
+    Args:
+        jug_1 (int): Capacity of Jug 1.
+        jug_2 (int): Capacity of Jug 2.
+        goal (int): The target amount of water to achieve.
+        codes (bytes | Sequence[int]): The packed actions (see `pack_actions` and `pack_json_actions`).
+    """
+    invalid_idx, reason, total_water = replay_packed(jug_1, jug_2, codes)
+    valid = invalid_idx is None
+    solved = valid and total_water == goal
+    if valid and not solved:
+        reason = "Goal not reached"
+    optimal_steps = None
+    if not is_solvable(jug_1, jug_2, goal):
+        optimal = None
+    elif not solved:
+        optimal = False
+    else:
+        optimal_steps = solver_steps(jug_1, jug_2, goal)
+        optimal = None if optimal_steps is None else len(codes) <= optimal_steps
+    return VerificationResult(
+        steps=len(codes),
+        valid=valid,
+        solved=solved,
+        first_invalid_step=None if valid else invalid_idx + 1,
+        reason=reason,
+        solver_steps=optimal_steps,
+        optimal=optimal,
+    )
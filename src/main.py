@@ -1,20 +1,32 @@
 import sys
 
+from jug_riddle.command_line import batch_solve_water_jug_riddles
 from ui.jug_riddle_ui import water_jug_riddle_ui
 from web.solver_endpoint import run_flask_app
 
 if __name__ == "__main__":
-    import threading
+    if sys.argv[1:2] == ["batch"]:
+        # Headless mode: solve the riddles given in a file (or stdin) and exit
+        sys.exit(batch_solve_water_jug_riddles(sys.argv[2:]))
+    if sys.argv[1:2] == ["asgi"]:
+        # API only, served by the asyncio (ASGI) variant of the solver API
+        from web.asgi_endpoint import run_asgi_app
 
-    # Create a thread for the Flask app so the GUI can be spawn while the flask server is running
-    flask_thread = threading.Thread(target=run_flask_app)
-    # Start the thread
-    flask_thread.start()
+        run_asgi_app()
+        sys.exit(0)
+
+    import multiprocessing
+
+    # Run the Flask app in its own process so the GUI can be spawn while the flask server is running
+    # (and they don't compete for the GIL)
+    flask_process = multiprocessing.Process(target=run_flask_app)
+    # Start the process
+    flask_process.start()
 
     # Run the GUI
     water_jug_riddle_ui()
 
-    # Wait for the Flask thread to finish (if needed)
-    flask_thread.join()
+    # Wait for the Flask process to finish (if needed)
+    flask_process.join()
 
     sys.exit(0)
@@ -1,2 +1,10 @@
+from .test_jug_riddle_batch import *
+from .test_jug_riddle_differential import *
 from .test_jug_riddle_game import *
+from .test_jug_riddle_observers import *
 from .test_jug_riddle_solver import *
+from .test_jug_riddle_verifier import *
+from .test_ui_jug_riddle_ui import *
+from .test_web_asgi_endpoint import *
+from .test_web_loadgen import *
+from .test_web_solver_endpoint import *
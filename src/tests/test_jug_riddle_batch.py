@@ -0,0 +1,53 @@
+import unittest
+
+from jug_riddle.batch import CSV, NDJSON, parse_line, solve_lines
+
+
+class TestJugRiddleBatch(unittest.TestCase):
+    def test_parse_line(self):
+        self.assertEqual(
+            parse_line('{"jug1_capacity": 4, "jug2_capacity": 3, "goal": 2}', NDJSON),
+            (4, 3, 2),
+        )
+        self.assertEqual(parse_line("[7, 4, 3]", NDJSON), (7, 4, 3))
+        self.assertEqual(parse_line("7,4,3", CSV), (7, 4, 3))
+        with self.assertRaises(ValueError):
+            parse_line("7,4", CSV)
+        for line in ("[4.9, 3, 2]", "[4, 3, true]", '["4", 3, 2]', '{"jug1_capacity": 4, "goal": 2}'):
+            with self.assertRaises(ValueError, msg=line):
+                parse_line(line, NDJSON)
+        with self.assertRaises(ValueError):
+            parse_line("4.9,3,2", CSV)
+
+    def test_solve_lines_csv(self):
+        lines = ["jug1_capacity,jug2_capacity,goal", "7,4,3", "", "6,4,3", "x,1,1"]
+        results = list(solve_lines(lines, CSV, workers=1))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["status"], "Solved")
+        self.assertEqual(
+            results[0]["response"],
+            [
+                {"jug": 1, "action": "FILL"},
+                {"jug": 1, "action": "TRANSFER"},
+                {"jug": 2, "action": "EMPTY"},
+            ],
+        )
+        self.assertEqual(results[1]["status"], "Unsolvable")
+        self.assertIn("error", results[2])
+
+    def test_solve_lines_reports_non_integers(self):
+        results = list(solve_lines(["[4.9, 3, 2]", "[4, 3, 2]"], NDJSON, workers=1))
+        self.assertEqual(results[0], {"input": "[4.9, 3, 2]", "error": "Expected an integer, got 4.9"})
+        self.assertEqual(results[1]["status"], "Solved")
+
+    def test_solve_lines_keeps_input_order(self):
+        lines = [f"[{x}, {y}, {z}]" for x in range(1, 8) for y in range(1, 8) for z in range(8)]
+        sequential = list(solve_lines(lines, NDJSON, workers=1))
+        parallel = list(solve_lines(lines, NDJSON, workers=2, chunk_size=5))
+        self.assertEqual(len(parallel), len(lines))
+        self.assertEqual(sequential, parallel)
+
+    def test_solve_lines_rejects_empty_chunks(self):
+        with self.assertRaises(ValueError):
+            solve_lines(["7,4,3"], CSV, chunk_size=0)
@@ -0,0 +1,62 @@
+import unittest
+
+from jug_riddle import Jug, JugAction
+from jug_riddle.differential import check, min_steps_by_total, replay, verify
+
+
+class TestJugRiddleDifferential(unittest.TestCase):
+    def test_min_steps_by_total(self):
+        min_steps = min_steps_by_total(4, 3)
+        self.assertEqual(min_steps[0], 0)
+        self.assertEqual(min_steps[4], 1)  # Fill Jug 1
+        self.assertEqual(min_steps[7], 2)  # Fill both jugs
+        self.assertEqual(min_steps[1], 3)  # Fill Jug 1, transfer, empty Jug 2
+        self.assertEqual(set(min_steps), set(range(8)))
+
+    def test_replay(self):
+        self.assertIsNone(
+            replay(4, 2, 2, [(JugAction.FILL, Jug.JUG_2)]),
+        )
+        self.assertEqual(
+            replay(4, 2, 2, [(JugAction.EMPTY, Jug.JUG_2)]),
+            "step 1 is invalid: Trying to empty an already empty jug!",
+        )
+        self.assertEqual(
+            replay(4, 2, 2, [(JugAction.FILL, Jug.JUG_1)]),
+            "solution does not reach the goal",
+        )
+
+    def test_check(self):
+        for fast in (False, True):
+            self.assertIsNone(check(7, 4, 3, min_steps_by_total(7, 4), fast=fast))
+            self.assertIsNone(check(6, 4, 3, min_steps_by_total(6, 4), fast=fast))
+
+    def test_verify(self):
+        report = verify(8, workers=1, skip_goal_zero=True)
+        self.assertEqual(report["checked"], 8 * 8 * 8)
+        self.assertEqual(report["failed"], 0)
+
+        fast = verify(8, workers=1, fast=True, full_check_every=7, skip_goal_zero=True)
+        self.assertEqual(fast["checked"], 8 * 8 * 8)
+        self.assertEqual(fast["failed"], 0)
+
+        sampled = verify(8, samples=50, seed=1, workers=1, shard_size=20, skip_goal_zero=True)
+        self.assertEqual(sampled["checked"], 50)
+        self.assertEqual(sampled["failed"], 0)
+
+    def test_known_issue_goal_zero(self):
+        # Goal 0 needs no actions at all, but the solver still pours some water around.
+        # This is why `--skip-goal-zero` exists: remove it (and this test) once the solver is fixed.
+        report = verify(8, max_goal=0, workers=1)
+        self.assertEqual(report["checked"], 8 * 8)
+        self.assertEqual(report["failed"], 8 * 8)
+        self.assertEqual(verify(8, max_goal=0, workers=1, fast=True)["failed"], 8 * 8)
+        self.assertEqual(
+            report["failures"][0],
+            {
+                "jug_1": 1,
+                "jug_2": 1,
+                "goal": 0,
+                "reason": "solved in 3 steps, but 0 is the minimum",
+            },
+        )
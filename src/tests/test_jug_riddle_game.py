@@ -1,8 +1,8 @@
 import unittest
 
-from ..jug_riddle.exceptions import InvalidAction
-from ..jug_riddle.game import JugRiddle
-from ..jug_riddle.types import Jug, JugAction
+from jug_riddle.exceptions import InvalidAction
+from jug_riddle.game import JugRiddle
+from jug_riddle.types import Jug, JugAction
 
 
 class TestJugRiddle(unittest.TestCase):
@@ -0,0 +1,167 @@
+import gc
+import io
+import threading
+import unittest
+import weakref
+
+from jug_riddle import Jug, JugAction, JugRiddle, UnsolvableRiddle, solve
+from jug_riddle import observers
+from jug_riddle.observers import ProfilerObserver, RiddleObserver, SampledObserver
+
+
+class RecordingObserver(RiddleObserver):
+    def __init__(self):
+        self.events = []
+
+    def on_solve_start(self, riddle):
+        self.events.append("solve_start")
+
+    def on_strategy_start(self, riddle, pouring_jug):
+        self.events.append(("strategy_start", pouring_jug))
+
+    def on_step(self, riddle, jug, jug_action):
+        self.events.append((jug_action, jug))
+
+    def on_strategy_chosen(self, riddle, pouring_jug):
+        self.events.append(("strategy_chosen", pouring_jug))
+
+    def on_solve_end(self, riddle, solution):
+        self.events.append(("solve_end", solution is not None))
+
+
+class TestJugRiddleObservers(unittest.TestCase):
+    def test_riddle_observer(self):
+        riddle = JugRiddle(4, 3, 2)
+        observer = RecordingObserver()
+
+        riddle.add_observer(observer)
+        riddle.take_action(Jug.JUG_1, JugAction.FILL)
+        riddle.take_action(Jug.JUG_1, JugAction.TRANSFER)
+        riddle.remove_observer(observer)
+        riddle.take_action(Jug.JUG_2, JugAction.EMPTY)
+
+        self.assertEqual(
+            observer.events,
+            [(JugAction.FILL, Jug.JUG_1), (JugAction.TRANSFER, Jug.JUG_1)],
+        )
+        # Without observers, the plain `take_action` is used again
+        self.assertIs(type(riddle), JugRiddle)
+
+    def test_solve_observer(self):
+        observer = RecordingObserver()
+        observers.attach(observer)
+        try:
+            solution = solve(JugRiddle(7, 4, 3))
+            with self.assertRaises(UnsolvableRiddle):
+                solve(JugRiddle(6, 4, 3))
+        finally:
+            observers.detach(observer)
+
+        self.assertEqual(observer.events[0], "solve_start")
+        self.assertEqual(observer.events[1], ("strategy_start", Jug.JUG_1))
+        self.assertEqual(observer.events[2:5], solution._actions)
+        self.assertIn(("strategy_start", Jug.JUG_2), observer.events)
+        self.assertEqual(
+            observer.events[-4:],
+            [
+                ("strategy_chosen", Jug.JUG_1),
+                ("solve_end", True),
+                "solve_start",
+                ("solve_end", False),
+            ],
+        )
+        # Solution riddles are handed back without observers
+        self.assertIs(type(solution), JugRiddle)
+
+    def test_sampled_observer(self):
+        observer = RecordingObserver()
+        riddle = JugRiddle(4, 3, 2)
+        riddle.add_observer(SampledObserver(observer, every=2))
+        riddle.take_action(Jug.JUG_1, JugAction.FILL)
+        riddle.take_action(Jug.JUG_1, JugAction.TRANSFER)
+        riddle.take_action(Jug.JUG_2, JugAction.EMPTY)
+
+        self.assertEqual(observer.events, [(JugAction.TRANSFER, Jug.JUG_1)])
+        # Sampling an observer that does not care about steps does not hook it into the steps
+        self.assertTrue(observers.observes_steps(SampledObserver(observer, every=2)))
+        self.assertFalse(observers.observes_steps(SampledObserver(ProfilerObserver(), every=2)))
+
+    def test_observed_riddle_has_no_reference_cycle(self):
+        gc.disable()
+        try:
+            riddle = JugRiddle(4, 3, 2)
+            riddle.add_observer(RecordingObserver())
+            ref = weakref.ref(riddle)
+            del riddle
+            self.assertIsNone(ref())
+        finally:
+            gc.enable()
+
+    def test_profiler_observer(self):
+        stream = io.StringIO()
+        profiler = ProfilerObserver(stream)
+        observers.attach(profiler)
+        try:
+            solution = solve(JugRiddle(3, 5, 4))
+        finally:
+            observers.detach(profiler)
+
+        self.assertEqual(
+            set(profiler.report["phases"]),
+            {"pour from JUG_1", "pour from JUG_2", "solve"},
+        )
+        self.assertEqual(profiler.report["solution_steps"], len(solution))
+        self.assertIn("Solve profile for riddle (3, 5, 4)", stream.getvalue())
+
+    def test_profiler_observer_threads(self):
+        stream = io.StringIO()
+        profiler = ProfilerObserver(stream)
+        errors = []
+
+        def solve_many():
+            try:
+                for _ in range(50):
+                    solve(JugRiddle(1009, 1013, 1))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=solve_many) for _ in range(4)]
+        observers.attach(profiler)
+        with self.assertNoLogs("jug_riddle", level="ERROR"):
+            try:
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            finally:
+                observers.detach(profiler)
+
+        self.assertEqual(errors, [])
+        self.assertEqual(stream.getvalue().count("Solve profile for riddle (1009, 1013, 1)"), 200)
+        self.assertEqual(
+            set(profiler.report["phases"]),
+            {"pour from JUG_1", "pour from JUG_2", "solve"},
+        )
+
+    def test_failing_observer(self):
+        class FailingObserver(RiddleObserver):
+            def on_solve_start(self, riddle):
+                raise RuntimeError("on_solve_start")
+
+            def on_step(self, riddle, jug, jug_action):
+                raise RuntimeError("on_step")
+
+        recorder = RecordingObserver()
+        observers.attach(FailingObserver())
+        observers.attach(recorder)
+        try:
+            with self.assertLogs("jug_riddle", level="ERROR"):
+                solution = solve(JugRiddle(7, 4, 3))
+        finally:
+            for observer in observers.attached():
+                observers.detach(observer)
+
+        # The solve, and the other observers, are not affected
+        self.assertEqual(len(solution), 3)
+        self.assertEqual(recorder.events[0], "solve_start")
+        self.assertEqual(recorder.events[-1], ("solve_end", True))
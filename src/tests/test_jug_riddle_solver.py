@@ -1,6 +1,13 @@
 import unittest
 
-from ..jug_riddle import Jug, JugAction, JugRiddle, UnsolvableRiddle, solve
+from jug_riddle import (
+    Jug,
+    JugAction,
+    JugRiddle,
+    SolveCancelled,
+    UnsolvableRiddle,
+    solve,
+)
 
 
 class TestJugRiddleSolver(unittest.TestCase):
@@ -34,3 +41,20 @@ class TestJugRiddleSolver(unittest.TestCase):
         ]
 
         self.assertEqual(solution._actions, expected_actions)
+
+    def test_solve_reports_progress(self):
+        # Test the progress callback is called while solving a long riddle
+        reported = []
+        solution = solve(JugRiddle(1009, 1013, 1), progress=reported.append)
+
+        self.assertTrue(solution.done)
+        self.assertTrue(reported)
+        self.assertEqual(reported, sorted(reported))
+
+    def test_solve_cancelled(self):
+        # Test a solve can be aborted from the progress callback
+        def cancel(steps):
+            raise SolveCancelled()
+
+        with self.assertRaises(SolveCancelled):
+            solve(JugRiddle(1009, 1013, 1), progress=cancel)
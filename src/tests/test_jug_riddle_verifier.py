@@ -0,0 +1,113 @@
+import unittest
+
+from jug_riddle import Jug, JugAction, JugRiddle, UnsolvableRiddle, solve
+from jug_riddle.verifier import (
+    EMPTY_2,
+    FILL_1,
+    FILL_2,
+    TRANSFER_1,
+    _pour,
+    _pour_steps,
+    is_solvable,
+    pack_actions,
+    pack_json_actions,
+    solver_actions,
+    solver_steps,
+    verify,
+)
+
+
+class TestJugRiddleVerifier(unittest.TestCase):
+    def test_pack_actions(self):
+        actions = [
+            (JugAction.FILL, Jug.JUG_1),
+            (JugAction.TRANSFER, Jug.JUG_1),
+            (JugAction.EMPTY, Jug.JUG_2),
+        ]
+        self.assertEqual(pack_actions(actions), bytes([FILL_1, TRANSFER_1, EMPTY_2]))
+        self.assertEqual(
+            pack_json_actions(
+                [
+                    {"jug": 1, "action": "FILL"},
+                    {"jug": 1, "action": "TRANSFER"},
+                    {"jug": 2, "action": "EMPTY"},
+                    {"jug": 3, "action": "EMPTY"},
+                ]
+            ),
+            bytes([FILL_1, TRANSFER_1, EMPTY_2, 255]),
+        )
+
+    def test_verify_optimal_solution(self):
+        result = verify(7, 4, 3, bytes([FILL_1, TRANSFER_1, EMPTY_2]))
+        self.assertTrue(result.valid)
+        self.assertTrue(result.solved)
+        self.assertTrue(result.optimal)
+        self.assertIsNone(result.first_invalid_step)
+        self.assertEqual(result.solver_steps, 3)
+
+    def test_verify_invalid_step(self):
+        result = verify(7, 4, 3, bytes([FILL_1, TRANSFER_1, FILL_1, FILL_1]))
+        self.assertFalse(result.valid)
+        self.assertFalse(result.optimal)
+        self.assertEqual(result.first_invalid_step, 4)
+        self.assertEqual(result.reason, "Trying to fill an already full jug!")
+
+    def test_verify_goal_not_reached(self):
+        result = verify(7, 4, 3, bytes([FILL_1]))
+        self.assertTrue(result.valid)
+        self.assertFalse(result.solved)
+        self.assertEqual(result.reason, "Goal not reached")
+
+    def test_verify_longer_solution(self):
+        result = verify(7, 4, 3, bytes([FILL_2, EMPTY_2, FILL_1, TRANSFER_1, EMPTY_2]))
+        self.assertTrue(result.solved)
+        self.assertFalse(result.optimal)
+        self.assertEqual(result.solver_steps, 3)
+
+    def test_verify_does_not_solve_unless_needed(self):
+        result = verify(1_000_003, 1_000_000, 1, bytes([FILL_1]))
+        self.assertFalse(result.solved)
+        self.assertIsNone(result.solver_steps)
+        self.assertFalse(result.optimal)
+
+    def test_solver_steps_large_capacities(self):
+        # The solver takes 1.3 million actions here, which are counted without taking them
+        self.assertEqual(solver_steps(1_000_003, 1_000_000, 1), 1_333_333)
+        self.assertIsNone(solver_steps(0, 5, 5))
+
+    def test_pour_steps(self):
+        # The arithmetic count must match the action by action simulation of the solver
+        for jug_1 in range(1, 40):
+            for jug_2 in range(1, 40):
+                for goal in range(0, max(jug_1, jug_2) + 1):
+                    if not is_solvable(jug_1, jug_2, goal):
+                        continue
+                    self.assertEqual(
+                        _pour_steps(jug_1, jug_2, goal),
+                        _pour(jug_1, jug_2, goal, Jug.JUG_1),
+                        (jug_1, jug_2, goal),
+                    )
+
+    def test_verify_unsolvable_riddle(self):
+        result = verify(6, 4, 3, bytes([FILL_1]))
+        self.assertIsNone(result.solver_steps)
+        self.assertIsNone(result.optimal)
+
+    def test_solver_steps(self):
+        # The number of steps must match the solution found by the solver
+        for jug_1 in range(1, 10):
+            for jug_2 in range(1, 10):
+                for goal in range(0, 10):
+                    try:
+                        solution = solve(JugRiddle(jug_1, jug_2, goal))
+                    except UnsolvableRiddle:
+                        self.assertIsNone(solver_steps(jug_1, jug_2, goal))
+                        self.assertIsNone(solver_actions(jug_1, jug_2, goal))
+                        continue
+                    self.assertEqual(
+                        solver_actions(jug_1, jug_2, goal), pack_actions(solution._actions)
+                    )
+                    self.assertEqual(solver_steps(jug_1, jug_2, goal), len(solution))
+                    result = verify(jug_1, jug_2, goal, pack_actions(solution._actions))
+                    self.assertTrue(result.solved)
+                    self.assertTrue(result.optimal)
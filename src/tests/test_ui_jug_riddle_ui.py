@@ -0,0 +1,27 @@
+import unittest
+
+from jug_riddle import JugRiddle
+from ui.jug_riddle_ui import BackgroundSolver
+
+
+class TestBackgroundSolver(unittest.TestCase):
+    def run_solver(self, riddle):
+        solver = BackgroundSolver(riddle)
+        solver.start()
+        solver.join(timeout=5)
+        events = []
+        while not solver.events.empty():
+            events.append(solver.events.get())
+        return events
+
+    def test_solved(self):
+        kind, riddle = self.run_solver(JugRiddle(3, 2, 1))[-1]
+        self.assertEqual(kind, "solved")
+        self.assertTrue(riddle.done)
+
+    def test_unexpected_errors_are_reported(self):
+        # Empty jugs are not a valid riddle, but the GUI must hear back from the solver anyway
+        for capacities in ((0, 0, 0), (0, 5, 0)):
+            kind, error = self.run_solver(JugRiddle(*capacities))[-1]
+            self.assertEqual(kind, "error", capacities)
+            self.assertIsInstance(error, Exception)
@@ -0,0 +1,73 @@
+import json
+import unittest
+
+import httpx
+
+from web.asgi_endpoint import SolverApp
+from web.caching import solution_etag
+
+
+class TestAsgiEndpoint(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.app = SolverApp(workers=2)
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=self.app), base_url="http://test"
+        )
+
+    async def asyncTearDown(self):
+        await self.client.aclose()
+        self.app.close()
+
+    async def test_solve_cached(self):
+        url = "/solve?jug1_capacity=3&jug2_capacity=2&goal=1"
+        response = await self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["etag"], f'"{solution_etag(3, 2, 1)}"')
+        self.assertIn("immutable", response.headers["cache-control"])
+        self.assertEqual(response.json()["status"], "Solved")
+
+        response = await self.client.get(url, headers={"If-None-Match": response.headers["etag"]})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    async def test_batch_keeps_input_order(self):
+        lines = [f"[{x}, {y}, {z}]" for x in range(1, 6) for y in range(1, 6) for z in range(6)]
+        response = await self.client.post(
+            "/solve/batch?workers=64&chunk_size=7", content="\n".join(lines)
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["content-type"], "application/x-ndjson")
+        results = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(
+            [[r["jug1_capacity"], r["jug2_capacity"], r["goal"]] for r in results],
+            [json.loads(line) for line in lines],
+        )
+
+    async def test_batch_bad_request(self):
+        for query in ("chunk_size=0", "format=xml", "workers=x"):
+            response = await self.client.post(f"/solve/batch?{query}", content="[4, 3, 2]")
+            self.assertEqual(response.status_code, 400, query)
+
+    async def test_batch_line_too_long(self):
+        self.app.MAX_LINE_LENGTH = 100
+        response = await self.client.post("/solve/batch", content=b"[" + b" " * 200)
+        self.assertEqual(response.status_code, 413)
+
+        # Once results have been sent, the stream ends with an error record
+        response = await self.client.post(
+            "/solve/batch?chunk_size=1&workers=1",
+            content=b"[4, 3, 2]\n[7, 4, 3]\n[" + b" " * 200,
+        )
+        self.assertEqual(response.status_code, 200)
+        results = [json.loads(line) for line in response.text.splitlines()]
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0]["goal"], 2)
+        self.assertIn("error", results[-1])
+
+    async def test_not_found(self):
+        response = await self.client.get("/nope")
+        self.assertEqual(response.status_code, 404)
+        response = await self.client.post("/solve")
+        self.assertEqual(response.status_code, 405)
+        response = await self.client.get("/solve/batch")
+        self.assertEqual(response.status_code, 405)
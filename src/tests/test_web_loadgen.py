@@ -0,0 +1,76 @@
+import asyncio
+import unittest
+
+from web.loadgen import (
+    FlaskTarget,
+    LoadTest,
+    RequestGenerator,
+    parse_mix,
+    percentile,
+    response_error,
+)
+
+
+class TestLoadgen(unittest.TestCase):
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 0.5), 50)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile(values, 0.999), 100)
+        self.assertEqual(percentile(values, 0), 1)
+        self.assertEqual(percentile([7], 0.9), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_parse_mix(self):
+        self.assertEqual(
+            parse_mix("solvable=8, unsolvable=1,conditional=0.5"),
+            {"solvable": 8.0, "unsolvable": 1.0, "conditional": 0.5},
+        )
+        with self.assertRaises(ValueError):
+            parse_mix("solvable=8,slow=1")
+        with self.assertRaises(ValueError):
+            parse_mix("solvable=x")
+
+    def test_response_error(self):
+        self.assertIsNone(response_error("solvable", 200, b'{"response": [], "status": "Solved"}'))
+        self.assertIsNone(response_error("unsolvable", 200, b'{"status": "Unsolvable"}'))
+        self.assertIsNone(response_error("invalid", 200, b'{"error": "bad input"}'))
+        self.assertIsNone(response_error("conditional", 304, b""))
+        # Errors are reported with a 200 by the API, so the body has to be checked
+        self.assertEqual(response_error("solvable", 200, b'{"error": "bad input"}'), "error reported")
+        self.assertEqual(response_error("solvable", 200, b'{"status": "Unsolvable"}'), "status Unsolvable")
+        self.assertEqual(response_error("invalid", 200, b'{"status": "Solved"}'), "no error reported")
+        self.assertEqual(response_error("conditional", 200, b"{}"), "HTTP 200")
+        self.assertEqual(response_error("solvable", 500, b""), "HTTP 500")
+        self.assertEqual(response_error("solvable", 200, b"<html>"), "invalid JSON")
+
+    def test_report(self):
+        load_test = LoadTest(None, None, concurrency=2, requests=4)
+        load_test.sent = 4
+        load_test.latencies = [0.004, 0.001, 0.003, 0.002]
+        load_test.statuses = {200: 3, 304: 1}
+        load_test.errors = {"solvable: status Unsolvable": 1}
+
+        report = load_test.report(elapsed=2.0)
+        self.assertEqual(report["mode"], "closed")
+        self.assertEqual(report["throughput_rps"], 2.0)
+        self.assertEqual(report["errors"], 1)
+        self.assertEqual(report["error_rate"], 0.25)
+        self.assertEqual(report["statuses"], {"200": 3, "304": 1})
+        self.assertAlmostEqual(report["latency_ms"]["mean"], 2.5)
+        self.assertAlmostEqual(report["latency_ms"]["p50"], 2.0)
+        self.assertAlmostEqual(report["latency_ms"]["max"], 4.0)
+
+        empty = LoadTest(None, None, concurrency=1, rate=10, duration=1).report(elapsed=0)
+        self.assertEqual(empty["mode"], "open")
+        self.assertIsNone(empty["error_rate"])
+        self.assertIsNone(empty["latency_ms"]["p99"])
+
+    def test_run(self):
+        mix = parse_mix("solvable=1,unsolvable=1,invalid=1,conditional=1")
+        generator = RequestGenerator(mix, max_capacity=20, seed=1)
+        load_test = LoadTest(FlaskTarget(), generator, concurrency=2, requests=40)
+
+        report = asyncio.run(load_test.run())
+        self.assertEqual(report["requests"], 40)
+        self.assertEqual(report["errors"], 0, report["errors_by_kind"])
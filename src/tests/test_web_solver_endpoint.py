@@ -0,0 +1,136 @@
+import json
+import unittest
+from unittest import mock
+
+from jug_riddle import observers
+from jug_riddle.verifier import FILL_1, TRANSFER_1
+from web.caching import solution_etag
+from web.solver_endpoint import app
+
+
+class TestSolverEndpointCaching(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_cache_headers(self):
+        response = self.client.get("/solve?jug1_capacity=3&jug2_capacity=2&goal=1")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_etag(), (solution_etag(3, 2, 1), False))
+        self.assertTrue(response.cache_control.public)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertGreater(response.cache_control.max_age, 0)
+
+    def test_not_modified_skips_solving(self):
+        etag = solution_etag(3, 2, 1)
+        with mock.patch("web.solver_endpoint.solve") as solve:
+            for if_none_match in (f'"{etag}"', f'W/"{etag}"', f'"other", "{etag}"', "*"):
+                response = self.client.get(
+                    "/solve?jug1_capacity=3&jug2_capacity=2&goal=1",
+                    headers={"If-None-Match": if_none_match},
+                )
+                self.assertEqual(response.status_code, 304, if_none_match)
+                self.assertEqual(response.get_etag(), (etag, False))
+                self.assertEqual(response.data, b"")
+        solve.assert_not_called()
+
+    def test_etag_mismatch_solves(self):
+        response = self.client.get(
+            "/solve?jug1_capacity=3&jug2_capacity=2&goal=1",
+            headers={"If-None-Match": f'"{solution_etag(3, 2, 2)}"'},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["status"], "Solved")
+
+    def test_etag_depends_on_the_riddle(self):
+        etags = {solution_etag(3, 2, 1), solution_etag(3, 2, 2), solution_etag(2, 3, 1)}
+        self.assertEqual(len(etags), 3)
+        self.assertEqual(solution_etag(3, 2, 1), solution_etag(3, 2, 1))
+
+    def test_solves_with_the_same_package(self):
+        # Observers attached by the tests must be notified of the solves made by the app
+        observer = mock.Mock(spec=observers.RiddleObserver)
+        observers.attach(observer)
+        try:
+            self.client.get("/solve?jug1_capacity=5&jug2_capacity=2&goal=1")
+        finally:
+            observers.detach(observer)
+        observer.on_solve_start.assert_called_once()
+
+
+class TestSolverEndpointBatch(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_batch_keeps_input_order(self):
+        lines = [f"[{x}, {y}, {z}]" for x in range(1, 6) for y in range(1, 6) for z in range(6)]
+        response = self.client.post(
+            "/solve/batch?workers=64&chunk_size=7", data="\n".join(lines)
+        )
+
+        self.assertEqual(response.status_code, 200)
+        results = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual(
+            [[r["jug1_capacity"], r["jug2_capacity"], r["goal"]] for r in results],
+            [json.loads(line) for line in lines],
+        )
+
+    def test_batch_rejects_empty_chunks(self):
+        for chunk_size in (0, -1):
+            response = self.client.post(f"/solve/batch?chunk_size={chunk_size}", data="[4, 3, 2]")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("error", response.json)
+
+
+class TestSolverEndpointVerify(unittest.TestCase):
+    def setUp(self):
+        self.client = app.test_client()
+
+    def test_verify_json(self):
+        response = self.client.post(
+            "/verify",
+            json={
+                "jug1_capacity": 7,
+                "jug2_capacity": 4,
+                "goal": 3,
+                "actions": [
+                    {"jug": 1, "action": "FILL"},
+                    {"jug": 1, "action": "TRANSFER"},
+                    {"jug": 2, "action": "EMPTY"},
+                ],
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json,
+            {
+                "steps": 3,
+                "valid": True,
+                "solved": True,
+                "first_invalid_step": None,
+                "reason": None,
+                "solver_steps": 3,
+                "optimal": True,
+            },
+        )
+
+    def test_verify_packed(self):
+        response = self.client.post(
+            "/verify?jug1_capacity=7&jug2_capacity=4&goal=3",
+            data=bytes([FILL_1, TRANSFER_1, FILL_1, FILL_1]),
+            content_type="application/octet-stream",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json["valid"])
+        self.assertEqual(response.json["first_invalid_step"], 4)
+        self.assertEqual(response.json["reason"], "Trying to fill an already full jug!")
+
+    def test_verify_bad_request(self):
+        for kwargs in (
+            {"json": {"jug1_capacity": 7, "jug2_capacity": 4, "goal": 3}},
+            {"json": {"jug1_capacity": "x", "jug2_capacity": 4, "goal": 3, "actions": []}},
+            {"data": bytes([FILL_1]), "content_type": "application/octet-stream"},
+        ):
+            response = self.client.post("/verify", **kwargs)
+            self.assertEqual(response.status_code, 400, kwargs)
+            self.assertIn("error", response.json)
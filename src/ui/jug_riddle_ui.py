@@ -1,6 +1,16 @@
+import queue
+import threading
 import tkinter as tk
+from tkinter import messagebox
 
-from jug_riddle import Jug, JugAction, JugRiddle, UnsolvableRiddle, solve
+from jug_riddle import (
+    Jug,
+    JugAction,
+    JugRiddle,
+    SolveCancelled,
+    UnsolvableRiddle,
+    solve,
+)
 
 
 class WaterJugGUI:
@@ -81,10 +91,127 @@ class InputFrame:
         self.switch_to_riddle(jug1_capacity, jug2_capacity, goal)
 
 
+class BackgroundSolver(threading.Thread):
+    """
+    Solves a riddle in a background thread, so the GUI stays responsive while solving.
+
+    The outcome is reported through `events`, a queue meant to be polled from the Tk event loop,
+    as `(kind, value)` tuples:
+        ("progress", steps): `steps` actions have been taken so far.
+        ("solved", riddle): The riddle was solved.
+        ("unsolvable", None): The riddle has no solution.
+        ("cancelled", None): The solve was cancelled (see `cancel`).
+        ("error", exception): The solver failed with an unexpected exception.
+
+    Args:
+        riddle (JugRiddle): The riddle to solve.
+    """
+
+    def __init__(self, riddle):
+        super().__init__(daemon=True)
+        self.riddle = riddle
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def progress(self, steps):
+        if self.cancelled.is_set():
+            raise SolveCancelled("Solve cancelled by the user")
+        self.events.put(("progress", steps))
+
+    def run(self):
+        try:
+            riddle = solve(self.riddle, progress=self.progress)
+        except UnsolvableRiddle:
+            self.events.put(("unsolvable", None))
+        except SolveCancelled:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            # e.g. a riddle with an empty jug. Reported to the GUI, which would otherwise wait forever
+            self.events.put(("error", e))
+        else:
+            self.events.put(("solved", riddle))
+
+
+class StepList:
+    """
+    A scrollable, read-only list of the steps of a riddle.
+
+    Only the rows that fit in the widget are rendered, and their text is requested on demand,
+    so the cost of showing (or scrolling) the list does not depend on how many steps there are.
+
+    Args:
+        master (tk.Widget): The parent widget.
+        rows (int): How many steps are visible at once.
+        width (int): Width of the list, in characters.
+    """
+
+    def __init__(self, master, rows=5, width=52):
+        self.rows = rows
+        self.frame = tk.Frame(master)
+        self.text = tk.Text(self.frame, height=rows, width=width, state="disabled")
+        self.scrollbar = tk.Scrollbar(self.frame, command=self.scroll)
+        self.text.pack(side="left")
+        self.scrollbar.pack(side="left", fill="y")
+        self.text.bind("<MouseWheel>", self.on_mouse_wheel)
+        self.text.bind("<Button-4>", lambda _: self.scroll("scroll", -1, "units"))
+        self.text.bind("<Button-5>", lambda _: self.scroll("scroll", 1, "units"))
+        # First visible row, number of rows and function returning the text of a row
+        self.top = 0
+        self.size = 0
+        self.row_text = None
+        # Shown instead of the rows when the list is empty
+        self.message = ""
+
+    def show(self, size, row_text):
+        """
+        Shows a list of `size` rows, scrolled so the last one is visible.
+        `row_text(idx)` must return the text of the idx-th row.
+        """
+        self.size = size
+        self.row_text = row_text
+        self.top = max(0, size - self.rows)
+        self.render()
+
+    def scroll(self, operation, amount, units=None):
+        """Handles the scrollbar commands ("moveto" and "scroll") as well as the mouse wheel"""
+        if operation == "moveto":
+            top = int(float(amount) * self.size)
+        elif units == "pages":
+            top = self.top + int(amount) * self.rows
+        else:
+            top = self.top + int(amount)
+        self.top = max(0, min(top, self.size - self.rows))
+        self.render()
+        return "break"
+
+    def on_mouse_wheel(self, event):
+        return self.scroll("scroll", -1 if 0 < event.delta else 1, "units")
+
+    def render(self):
+        last = min(self.top + self.rows, self.size)
+        if self.size:
+            content = "\n".join(self.row_text(idx) for idx in range(self.top, last))
+            self.scrollbar.set(self.top / self.size, last / self.size)
+        else:
+            content = self.message
+            self.scrollbar.set(0, 1)
+        self.text.config(state="normal")
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, content)
+        self.text.config(state="disabled")
+
+
 class RiddleFrame:
     """
     A frame for solving (manually or automatically) the Water Jug Riddle.
 
+    Widgets are created once and then updated in place on every step, so the cost of
+    a refresh does not depend on how many steps the solution has.
+    When solving automatically, the solution can be scrubbed through or played back.
+
     Args:
         root (tk.Tk): The root tkinter window.
         jug1_capacity (int): Capacity of Jug 1.
@@ -92,6 +219,11 @@ class RiddleFrame:
         goal (int): The goal amount of water to achieve.
     """
 
+    DEFAULT_FPS = 5
+    MAX_FPS = 60
+    # How often (in ms) a background solve is checked for progress
+    SOLVER_POLL_INTERVAL = 50
+
     def __init__(self, root, jug1_capacity, jug2_capacity, goal):
         self.root = root
         self.riddle = JugRiddle(jug1_capacity, jug2_capacity, goal)
@@ -101,29 +233,64 @@ class RiddleFrame:
         self.frame.pack(expand=True, fill="both")
         self.chose_mode = True
         self.action_jug = None
+        # Widgets, created on demand (see `display_*` methods)
+        self.jugs = {}
+        self.mode_buttons = []
+        self.back_button = None
+        self.step_message = None
+        self.next_button = None
+        self.step_list = None
+        self.scrub_bar = None
+        self.play_button = None
+        self.fps = None
+        # `after` callback id of the playback, if playing
+        self.playing = None
+        # Auto-solve running in the background, if any, and its widgets
+        self.solver = None
+        self.solver_widgets = []
+        self.solver_message = None
+
+    def display_jug(self, jug):
+        """
+        Creates the canvas for the given jug. The jug is drawn as a rectangle with
+        white and blue colors representing how full the jug is (see `draw_jug`).
+        """
+        canvas = tk.Canvas(self.frame, width=100, height=200, bg="white")
+        air = canvas.create_rectangle(20, 0, 80, 200, fill="white")
+        water = canvas.create_rectangle(20, 200, 80, 200, fill="blue")
+        label = canvas.create_text(50, 190)
+        canvas.pack(side="left", padx=10)
+        self.jugs[jug] = (canvas, air, water, label)
 
-    def draw_jug(self, canvas, capacity, current_water):
+    def draw_jug(self, jug, capacity, current_water):
         """
-        Draws thw jug in the given canvas. The jug is drawn as a rectangle with
-        white and blue colors representing how full the jug is.
+        Updates the drawing of the given jug.
         The jug is all white when empty, and the blue is drawn bottom up in relation
         on how full the jug is.
         """
+        canvas, air, water, label = self.jugs[jug]
         water_level = 200 - (current_water * 200 / capacity)
-        canvas.create_rectangle(20, 0, 80, water_level, fill="white")
-        canvas.create_rectangle(20, water_level, 80, 200, fill="blue")
-        canvas.create_text(50, 190, text=f"{current_water}/{capacity}")
-        canvas.pack(side="left", padx=10)
+        canvas.coords(air, 20, 0, 80, water_level)
+        canvas.coords(water, 20, water_level, 80, 200)
+        canvas.itemconfig(label, text=f"{current_water}/{capacity}")
 
     def display_stepper(self):
         # Buttons for moving through states
+        self.back_button = tk.Button(self.frame, text="<<", command=self.previous_action)
+        self.back_button.pack(side="left", padx=10)
+
+        self.step_message = tk.Message(self.frame, font="Arial 8")
+        self.step_message.pack(side="left", padx=10)
+
+        self.next_button = tk.Button(self.frame, text=">>", command=self.next_action)
+        self.next_button.pack(side="left", padx=10)
+
+    def update_stepper(self):
         if 0 < self.current_state:
             back_state = "normal"
         else:
             back_state = "disabled"
-        tk.Button(
-            self.frame, text="<<", command=self.previous_action, state=back_state
-        ).pack(side="left", padx=10)
+        self.back_button.config(state=back_state)
 
         if self.current_state == 0:
             action_msg = "Initial State"
@@ -131,28 +298,46 @@ class RiddleFrame:
             action_msg = "No actions yet"
         else:
             action_msg = f"Action {self.current_state} / {len(self.riddle)}"
-        tk.Message(self.frame, text=action_msg, font="Arial 8").pack(
-            side="left", padx=10
-        )
+        self.step_message.config(text=action_msg)
 
         if len(self.riddle) <= self.current_state:
             next_state = "disabled"
         else:
             next_state = "normal"
-        tk.Button(
-            self.frame, text=">>", command=self.next_action, state=next_state
-        ).pack(side="left", padx=10)
+        self.next_button.config(state=next_state)
 
     def display_message_area(self):
-        # Create text widget to show the actions taken there
-        text_area = tk.Text(self.frame, height=5, width=52)
+        # Create the list to show the actions taken there
+        self.step_list = StepList(self.frame)
         if self.unsolvable:
-            text_area.insert(tk.END, "*** RIDDLE IS UNSOLVABLE! ***")
-        for idx, (action, jug) in enumerate(
-            self.riddle._actions[0 : self.current_state]
-        ):
-            text_area.insert(tk.END, f"Step {idx+1}: {action.name} JUG {jug.value}\n")
-        text_area.pack(side="left", padx=10, pady=5)
+            self.step_list.message = "*** RIDDLE IS UNSOLVABLE! ***"
+        self.step_list.frame.pack(side="left", padx=10, pady=5)
+
+    def step_text(self, idx):
+        action, jug = self.riddle._actions[idx]
+        return f"Step {idx+1}: {action.name} JUG {jug.value}"
+
+    def display_playback_controls(self):
+        # Scrub bar to jump to any step, and autoplay at a configurable frame rate
+        controls = tk.Frame(self.frame)
+        self.scrub_bar = tk.Scale(
+            controls,
+            orient="horizontal",
+            from_=0,
+            to=len(self.riddle),
+            showvalue=False,
+            length=200,
+            command=self.scrub,
+        )
+        self.scrub_bar.pack(side="top", fill="x")
+        self.play_button = tk.Button(controls, text="Play", command=self.toggle_playback)
+        self.play_button.pack(side="left")
+        tk.Label(controls, text="Steps/sec:").pack(side="left")
+        self.fps = tk.IntVar(value=self.DEFAULT_FPS)
+        tk.Spinbox(
+            controls, from_=1, to=self.MAX_FPS, textvariable=self.fps, width=3
+        ).pack(side="left")
+        controls.pack(side="left", padx=10)
 
     def display_manual_controls(self):
         tk.Radiobutton(
@@ -182,36 +367,53 @@ class RiddleFrame:
 
     def display_riddle(self):
         # Create two Canvas widgets to draw the jugs
-        jug1_canvas = tk.Canvas(self.frame, width=100, height=200, bg="white")
-        jug2_canvas = tk.Canvas(self.frame, width=100, height=200, bg="white")
+        self.display_jug(Jug.JUG_1)
+        self.display_jug(Jug.JUG_2)
 
-        self.draw_jug(
-            jug1_canvas,
-            self.riddle.jug_1_capacity,
-            self.riddle._states[self.current_state].jug_1,
-        )
-        self.draw_jug(
-            jug2_canvas,
-            self.riddle.jug_2_capacity,
-            self.riddle._states[self.current_state].jug_2,
-        )
-
-        # Buttons for solving or playing
-        if self.chose_mode:
-            tk.Button(
-                self.frame, text="Solve Manually", command=self.play_riddle
-            ).pack()
-            tk.Button(
-                self.frame, text="Solve Automatically", command=self.solve_riddle
-            ).pack()
-        else:
-            self.display_stepper()
-            self.display_message_area()
-            if self.action_jug is not None:
-                self.display_manual_controls()
+        self.display_mode_buttons()
 
         # Pack the riddle frame to display it
         self.frame.pack()
+        self.refresh()
+
+    def display_mode_buttons(self):
+        # Buttons for solving or playing
+        self.mode_buttons = [
+            tk.Button(self.frame, text="Solve Manually", command=self.play_riddle),
+            tk.Button(self.frame, text="Solve Automatically", command=self.solve_riddle),
+        ]
+        for button in self.mode_buttons:
+            button.pack()
+
+    def hide_mode_buttons(self):
+        for button in self.mode_buttons:
+            button.destroy()
+        self.mode_buttons = []
+
+    def display_solver_progress(self):
+        # Progress of the background solve, and a button to cancel it
+        self.solver_message = tk.Message(self.frame, text="Solving...", width=200)
+        self.solver_message.pack()
+        cancel_button = tk.Button(self.frame, text="Cancel", command=self.cancel_solve)
+        cancel_button.pack()
+        self.solver_widgets = [self.solver_message, cancel_button]
+
+    def hide_solver_progress(self):
+        for widget in self.solver_widgets:
+            widget.destroy()
+        self.solver_widgets = []
+        self.solver_message = None
+
+    def display_solving_controls(self):
+        """Replaces the mode buttons with the controls used while solving the riddle"""
+        self.chose_mode = False
+        self.hide_mode_buttons()
+        self.display_stepper()
+        self.display_message_area()
+        if self.action_jug is not None:
+            self.display_manual_controls()
+        else:
+            self.display_playback_controls()
 
     def fill_action(self):
         self.riddle.take_action(Jug[self.action_jug.get()], JugAction.FILL)
@@ -229,13 +431,15 @@ class RiddleFrame:
         self.refresh()
 
     def refresh(self):
-        # Force a refresh of the frame
-        self.frame.update()
-        self.frame.update_idletasks()
-        # Clear the frame to remove previous jugs and buttons
-        for widget in self.frame.winfo_children():
-            widget.destroy()
-        self.display_riddle()
+        # Update the existing widgets to show the current state
+        state = self.riddle._states[self.current_state]
+        self.draw_jug(Jug.JUG_1, self.riddle.jug_1_capacity, state.jug_1)
+        self.draw_jug(Jug.JUG_2, self.riddle.jug_2_capacity, state.jug_2)
+        if not self.chose_mode:
+            self.update_stepper()
+            self.step_list.show(self.current_state, self.step_text)
+            if self.scrub_bar is not None:
+                self.scrub_bar.set(self.current_state)
 
     def previous_action(self):
         self.current_state = max(self.current_state - 1, 0)
@@ -248,18 +452,87 @@ class RiddleFrame:
         self.current_state = min(self.current_state + 1, len(self.riddle))
         self.refresh()
 
+    def scrub(self, value):
+        state = int(value)
+        if state != self.current_state:
+            self.current_state = state
+            self.refresh()
+
+    def toggle_playback(self):
+        if self.playing is not None:
+            self.stop_playback()
+            return
+        if len(self.riddle) <= self.current_state:
+            # Start over when the end of the solution has already been reached
+            self.current_state = 0
+            self.refresh()
+        self.play_button.config(text="Pause")
+        self.playback_step()
+
+    def stop_playback(self):
+        if self.playing is not None:
+            self.root.after_cancel(self.playing)
+            self.playing = None
+        self.play_button.config(text="Play")
+
+    def playback_step(self):
+        if len(self.riddle) <= self.current_state:
+            self.stop_playback()
+            return
+        self.next_action()
+        try:
+            fps = min(max(self.fps.get(), 1), self.MAX_FPS)
+        except tk.TclError:
+            # Not a number (e.g. the spinbox is being edited)
+            fps = self.DEFAULT_FPS
+        self.playing = self.root.after(1000 // fps, self.playback_step)
+
     def solve_riddle(self):
-        self.chose_mode = False
+        # Solve in the background, the result is picked up by `poll_solver`
+        self.hide_mode_buttons()
+        self.display_solver_progress()
+        self.solver = BackgroundSolver(self.riddle)
+        self.solver.start()
+        self.root.after(self.SOLVER_POLL_INTERVAL, self.poll_solver)
+
+    def cancel_solve(self):
+        if self.solver is not None:
+            self.solver.cancel()
+
+    def poll_solver(self):
+        kind, value = "progress", None
         try:
-            self.riddle = solve(self.riddle)
-        except UnsolvableRiddle:
+            # Drain the queue, only the latest progress matters
+            while kind == "progress":
+                kind, value = self.solver.events.get_nowait()
+        except queue.Empty:
+            pass
+        if kind == "progress":
+            if value is not None:
+                self.solver_message.config(text=f"Solving... ({value} actions so far)")
+            self.root.after(self.SOLVER_POLL_INTERVAL, self.poll_solver)
+            return
+
+        self.solver = None
+        self.hide_solver_progress()
+        if kind == "cancelled":
+            self.display_mode_buttons()
+            return
+        if kind == "error":
+            messagebox.showerror("Water Jug Riddle", f"Could not solve the riddle: {value!r}")
+            self.display_mode_buttons()
+            return
+        if kind == "solved":
+            self.riddle = value
+        else:
             self.unsolvable = True
         self.current_state = 0  # Reset the current state
+        self.display_solving_controls()
         self.refresh()
 
     def play_riddle(self):
-        self.chose_mode = False
         self.action_jug = tk.StringVar(value=Jug.JUG_1.name)
+        self.display_solving_controls()
         self.refresh()
 
 
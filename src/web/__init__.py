@@ -1 +1,11 @@
-from .solver_endpoint import *
+import importlib
+
+
+def __getattr__(name):
+    # The Flask app (`web.solver_endpoint`) is only imported when one of its names is used, so the
+    # other modules of the package (e.g. the ASGI app) can be imported without Flask
+    solver_endpoint = importlib.import_module(f"{__name__}.solver_endpoint")
+    try:
+        return getattr(solver_endpoint, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
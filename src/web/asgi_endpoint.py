@@ -0,0 +1,255 @@
+"""
+Asyncio (ASGI) variant of the solver API.
+
+It exposes the same contract as the Flask app (see `solver_endpoint`):
+- GET /solve, with the same caching headers and `If-None-Match` handling.
+- POST /solve/batch, streaming NDJSON results in input order.
+
+Solving is CPU bound, so it is offloaded to a pool of worker processes, and the event loop is only busy
+with I/O. That is what allows a single process to hold lots of (idle or slow) connections open.
+Batch requests read their body, and send their results, as they go: at most a bounded number of chunks
+are being solved at any time, and no more input is read until their results have been sent to the client
+(which waits for the client to read them when the server applies flow control). Lines longer than
+`SolverApp.MAX_LINE_LENGTH` are rejected, so a body without newlines can not be buffered indefinitely.
+
+The app is a plain ASGI callable, so it can be served by any ASGI server (see `run_asgi_app`) and tested
+in-process with any ASGI test client (e.g. `httpx.AsyncClient(transport=httpx.ASGITransport(app))`).
+"""
+import asyncio
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs
+
+import uvicorn
+
+from jug_riddle.batch import (
+    CSV,
+    DEFAULT_CHUNK_SIZE,
+    FORMATS,
+    NDJSON,
+    LineChunker,
+    solve_chunk,
+    solve_triple,
+)
+
+from .caching import CACHE_CONTROL, etag_matches, solution_etag
+
+
+class LineTooLong(Exception):
+    """A line of a batch request body is longer than `SolverApp.MAX_LINE_LENGTH`"""
+
+
+class SolverApp:
+    """
+    ASGI application solving Water Jug Riddles.
+
+    Args:
+        workers (int | None): Size of the process pool used to solve riddles. Defaults to the number of CPUs.
+    """
+
+    # Longest line (in bytes) accepted in a batch request body
+    MAX_LINE_LENGTH = 64 * 1024
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self.lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        if scope["path"] == "/solve" and scope["method"] == "GET":
+            await self.solve_water_jug(scope, send)
+        elif scope["path"] == "/solve/batch" and scope["method"] == "POST":
+            await self.solve_water_jug_batch(scope, receive, send)
+        elif scope["path"] in ("/solve", "/solve/batch"):
+            await self.send_json(send, 405, {"error": "Method Not Allowed"})
+        else:
+            await self.send_json(send, 404, {"error": "Not Found"})
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self.executor
+
+    def close(self):
+        """Shuts down the worker processes"""
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def send_json(self, send, status, body, headers=()):
+        body = json.dumps(body).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    *headers,
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    async def solve_water_jug(self, scope, send):
+        """
+        Automatic solver for the Water Jug Riddle. Same contract as `solver_endpoint.solve_water_jug`.
+        """
+        args = parse_qs(scope["query_string"].decode())
+        try:
+            # Get parameters from the query string
+            jug1_capacity = int(args.get("jug1_capacity", [None])[0])
+            jug2_capacity = int(args.get("jug2_capacity", [None])[0])
+            goal = int(args.get("goal", [None])[0])
+        except Exception as e:
+            await self.send_json(send, 200, {"error": str(e)})
+            return
+
+        etag = solution_etag(jug1_capacity, jug2_capacity, goal)
+        cache_headers = [
+            (b"etag", f'"{etag}"'.encode()),
+            (b"cache-control", CACHE_CONTROL.encode()),
+        ]
+        headers = dict(scope["headers"])
+        if_none_match = headers.get(b"if-none-match")
+        if if_none_match is not None and etag_matches(if_none_match.decode(), etag):
+            await send(
+                {"type": "http.response.start", "status": 304, "headers": cache_headers}
+            )
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.get_executor(), solve_triple, jug1_capacity, jug2_capacity, goal
+        )
+        await self.send_json(
+            send,
+            200,
+            {"response": result["response"], "status": result["status"]},
+            cache_headers,
+        )
+
+    async def solve_water_jug_batch(self, scope, receive, send):
+        """
+        Batch solver for the Water Jug Riddle. Same contract as `solver_endpoint.solve_water_jug_batch`:
+        `workers` bounds how many workers of the app's pool the request may use at once (clamped to
+        [1, pool size]), it does not change the size of the pool.
+
+        The response starts with the first results. A line longer than `MAX_LINE_LENGTH` is answered
+        with a 413 if no result has been sent yet, or ends the stream with an `error` record otherwise.
+        """
+        args = parse_qs(scope["query_string"].decode())
+        headers = dict(scope["headers"])
+        try:
+            fmt = args.get("format", [None])[0]
+            if fmt is None:
+                content_type = headers.get(b"content-type", b"").decode()
+                fmt = CSV if content_type.split(";")[0].strip() == "text/csv" else NDJSON
+            if fmt not in FORMATS:
+                raise ValueError(f"Unknown format '{fmt}'")
+            workers = int(args.get("workers", [self.workers])[0])
+            chunker = LineChunker(fmt, int(args.get("chunk_size", [DEFAULT_CHUNK_SIZE])[0]))
+        except Exception as e:
+            await self.send_json(send, 400, {"error": str(e)})
+            return
+
+        started = False
+
+        async def send_results(results, more_body=True):
+            nonlocal started
+            if not started:
+                started = True
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [(b"content-type", b"application/x-ndjson")],
+                    }
+                )
+            body = "".join(json.dumps(result) + "\n" for result in results)
+            await send({"type": "http.response.body", "body": body.encode(), "more_body": more_body})
+
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+        max_pending = 2 * min(max(workers, 1), self.workers)
+        pending = deque()
+        try:
+            async for chunk in self.read_chunks(receive, chunker):
+                pending.append(loop.run_in_executor(executor, solve_chunk, chunk, fmt))
+                if len(pending) >= max_pending:
+                    await send_results(await pending.popleft())
+            while pending:
+                await send_results(await pending.popleft())
+        except LineTooLong as e:
+            if not started:
+                await self.send_json(send, 413, {"error": str(e)})
+                return
+            while pending:
+                await send_results(await pending.popleft())
+            await send_results([{"error": str(e)}], more_body=False)
+            return
+        finally:
+            for future in pending:
+                future.cancel()
+        await send_results([], more_body=False)
+
+    async def read_chunks(self, receive, chunker: LineChunker):
+        """Reads the request body as it arrives and yields its (non blank) lines in chunks"""
+        async for line in self.read_lines(receive):
+            chunk = chunker.add(line)
+            if chunk is not None:
+                yield chunk
+        chunk = chunker.flush()
+        if chunk is not None:
+            yield chunk
+
+    def check_line_length(self, line: bytes):
+        if len(line) > self.MAX_LINE_LENGTH:
+            raise LineTooLong(f"Line longer than {self.MAX_LINE_LENGTH} bytes")
+
+    async def read_lines(self, receive):
+        """
+        Reads the request body as it arrives and yields its lines.
+        Raises `LineTooLong` as soon as a line is longer than `MAX_LINE_LENGTH`.
+        """
+        buffer = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            buffer += message.get("body", b"")
+            more_body = message.get("more_body", False)
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                self.check_line_length(line)
+                yield line.decode("utf-8", errors="replace")
+            # The line being read (without newline yet)
+            self.check_line_length(buffer)
+        if buffer:
+            yield buffer.decode("utf-8", errors="replace")
+
+
+app = SolverApp()
+
+
+def run_asgi_app():
+    uvicorn.run(app, host="0.0.0.0", port=5000)
@@ -0,0 +1,31 @@
+"""
+HTTP caching of `/solve` responses, shared by the Flask and the ASGI apps (and the load generator).
+"""
+import hashlib
+
+from jug_riddle import SOLVER_VERSION
+
+# Solutions never change for a given input (and solver version), so they can be cached "forever".
+SOLUTION_MAX_AGE = 365 * 24 * 60 * 60
+
+CACHE_CONTROL = f"public, max-age={SOLUTION_MAX_AGE}, immutable"
+
+
+def solution_etag(jug1_capacity: int, jug2_capacity: int, goal: int) -> str:
+    """
+    Strong ETag for the solution of a riddle.
+    It is derived from the canonical (i.e. parsed) inputs and the solver version, so it can be
+    computed before (and without) solving the riddle.
+    """
+    key = f"v{SOLVER_VERSION}:{jug1_capacity}:{jug2_capacity}:{goal}"
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an `If-None-Match` header matches the given ETag (weak comparison)"""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        if tag.strip().removeprefix("W/").strip('"') == etag:
+            return True
+    return False
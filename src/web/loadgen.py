@@ -0,0 +1,430 @@
+"""
+Load generator for the `/solve` endpoint.
+
+Requests are sent either to a running server (`--url`) or to the app itself, in-process (`--app flask`
+or `--app asgi`), and a JSON report is written with the throughput, the latency percentiles and the
+error rate. Two modes are supported:
+- closed loop (default): `--concurrency` clients send a request as soon as their previous one is answered.
+- open loop (`--rate`): requests are sent at a fixed rate, no matter how long the previous ones take.
+  Latencies are measured from the time each request was due, so a server falling behind shows up in them.
+
+The request mix is given as weights (`--mix solvable=8,unsolvable=1,invalid=0,conditional=1`):
+- solvable/unsolvable: riddles with/without solution.
+- invalid: requests with non integer parameters.
+- conditional: solvable riddles sent with a matching `If-None-Match` (i.e. expecting a 304).
+Responses are checked against their kind (see `response_error`): e.g. a solvable riddle answered
+with a 200 but without a solution counts as an error.
+Jug capacities are drawn from 1 to `--max-capacity`, uniformly or log-uniformly (`--distribution`).
+
+Usage (from the `src` directory):
+    python -m web.loadgen --url http://localhost:5000 --concurrency 16 --duration 30
+    python -m web.loadgen --app asgi --rate 200 --requests 5000 --max-capacity 1000
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from urllib.parse import urlencode, urlsplit
+
+from jug_riddle import JugRiddle
+from jug_riddle.solver import is_solvable
+
+from .caching import solution_etag
+
+REQUEST_KINDS = ("solvable", "unsolvable", "invalid", "conditional")
+DEFAULT_MIX = "solvable=8,unsolvable=1,invalid=0,conditional=1"
+
+
+class RequestGenerator:
+    """
+    Generates `/solve` requests (path and headers) following the given mix and size distribution.
+
+    Args:
+        mix (dict[str, float]): Weight of each kind of request (see `REQUEST_KINDS`).
+        max_capacity (int): Jug capacities go from 1 to `max_capacity`.
+        distribution (str): "uniform" or "loguniform" distribution of the capacities.
+        seed (int | None): Seed of the random generator.
+    """
+
+    def __init__(self, mix, max_capacity, distribution="uniform", seed=None):
+        self.kinds = [kind for kind in REQUEST_KINDS if mix.get(kind, 0) > 0]
+        self.weights = [mix[kind] for kind in self.kinds]
+        if not self.kinds:
+            raise ValueError("The request mix is empty")
+        self.max_capacity = max_capacity
+        self.distribution = distribution
+        self.random = random.Random(seed)
+
+    def capacity(self) -> int:
+        if self.distribution == "loguniform":
+            return int(math.exp(self.random.uniform(0, math.log(self.max_capacity + 1))))
+        return self.random.randint(1, self.max_capacity)
+
+    def riddle(self, solvable: bool) -> tuple[int, int, int]:
+        # Riddles are drawn until one with the wanted solvability is found. Unsolvable ones are rare
+        # for small capacities, so we give up after a while.
+        for _ in range(1000):
+            jug_1, jug_2 = self.capacity(), self.capacity()
+            goal = self.random.randint(0, max(jug_1, jug_2))
+            if not solvable:
+                goal = self.random.randint(0, jug_1 + jug_2)
+            if is_solvable(JugRiddle(jug_1, jug_2, goal)) == solvable:
+                return jug_1, jug_2, goal
+        raise ValueError(f"Could not generate a riddle with solvable={solvable}")
+
+    def request(self) -> tuple[str, str, dict]:
+        """Returns the kind, path (with query string) and headers of a new request"""
+        kind = self.random.choices(self.kinds, self.weights)[0]
+        headers = {}
+        if kind == "invalid":
+            params = {"jug1_capacity": "x", "jug2_capacity": 1, "goal": 1}
+        else:
+            jug_1, jug_2, goal = self.riddle(solvable=kind != "unsolvable")
+            params = {"jug1_capacity": jug_1, "jug2_capacity": jug_2, "goal": goal}
+            if kind == "conditional":
+                headers["If-None-Match"] = f'"{solution_etag(jug_1, jug_2, goal)}"'
+        return kind, f"/solve?{urlencode(params)}", headers
+
+
+class _Connection:
+    """A (keep-alive) HTTP/1.1 connection, just good enough to GET `/solve`"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def get(self, path, headers) -> tuple[int, bytes]:
+        reused = self.writer is not None
+        try:
+            return await self._get(path, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            if not reused:
+                raise
+        # The server closed the kept-alive connection in the meantime, retry on a new one
+        return await self._get(path, headers)
+
+    async def _get(self, path, headers) -> tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        request = f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+        request += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+        self.writer.write((request + "\r\n").encode())
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        version, status = status_line.decode().split()[:2]
+        response_headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode().partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if int(status) in (204, 304):
+            # No body, by definition
+            keep_alive = version == "HTTP/1.1"
+        elif "content-length" in response_headers:
+            body = await self.reader.readexactly(int(response_headers["content-length"]))
+            keep_alive = version == "HTTP/1.1"
+        elif response_headers.get("transfer-encoding", "").lower() == "chunked":
+            while size := int((await self.reader.readline()).split(b";")[0], 16):
+                body += (await self.reader.readexactly(size + 2))[:-2]
+            await self.reader.readline()
+            keep_alive = True
+        else:
+            body = await self.reader.read()
+            keep_alive = False
+        if not keep_alive or response_headers.get("connection", "").lower() == "close":
+            self.close()
+        return int(status), body
+
+
+class HttpTarget:
+    """Sends the requests to a running server, over at most `connections` connections"""
+
+    def __init__(self, url, connections):
+        parts = urlsplit(url)
+        self.pool = asyncio.Queue()
+        for _ in range(connections):
+            self.pool.put_nowait(_Connection(parts.hostname, parts.port or 80))
+
+    async def get(self, path, headers) -> tuple[int, bytes]:
+        """Returns the status and the body of the response"""
+        connection = await self.pool.get()
+        try:
+            return await connection.get(path, headers)
+        finally:
+            self.pool.put_nowait(connection)
+
+    async def close(self):
+        while not self.pool.empty():
+            self.pool.get_nowait().close()
+
+
+class AsgiTarget:
+    """Sends the requests to the ASGI app, in-process"""
+
+    def __init__(self):
+        from .asgi_endpoint import SolverApp
+
+        self.app = SolverApp()
+
+    async def get(self, path, headers) -> tuple[int, bytes]:
+        path, _, query_string = path.partition("?")
+        scope = {
+            "type": "http",
+            "method": "GET",
+            "path": path,
+            "query_string": query_string.encode(),
+            "headers": [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        }
+        response = {"body": b""}
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"] += message.get("body", b"")
+
+        await self.app(scope, receive, send)
+        return response["status"], response["body"]
+
+    async def close(self):
+        self.app.close()
+
+
+class FlaskTarget:
+    """Sends the requests to the Flask app, in-process (in a thread pool, as Flask is synchronous)"""
+
+    def __init__(self):
+        from .solver_endpoint import app
+
+        self.client = app.test_client()
+
+    async def get(self, path, headers) -> tuple[int, bytes]:
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            None, lambda: self.client.get(path, headers=headers)
+        )
+        return response.status_code, response.data
+
+    async def close(self):
+        pass
+
+
+def response_error(kind: str, status: int, body: bytes) -> str | None:
+    """Why the response to a request of the given kind is not the expected one, if it is not"""
+    if kind == "conditional":
+        return None if status == 304 else f"HTTP {status}"
+    if status != 200:
+        return f"HTTP {status}"
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return "invalid JSON"
+    if kind == "invalid":
+        return None if "error" in payload else "no error reported"
+    if "error" in payload:
+        return "error reported"
+    expected = "Solved" if kind == "solvable" else "Unsolvable"
+    if payload.get("status") != expected:
+        return f"status {payload.get('status')}"
+    return None
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float | None:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class LoadTest:
+    """
+    Runs a load test against `target` and collects the results.
+
+    Args:
+        target: Where the requests are sent (see `HttpTarget`, `AsgiTarget` and `FlaskTarget`).
+        generator (RequestGenerator): Generates the requests.
+        concurrency (int): Number of clients (closed loop) or connections (open loop, HTTP only).
+        rate (float | None): Requests per second. If given, the test runs in open loop.
+        requests (int | None): Stop after this many requests.
+        duration (float | None): Stop after this many seconds.
+    """
+
+    def __init__(self, target, generator, concurrency, rate=None, requests=None, duration=None):
+        if requests is None and duration is None:
+            raise ValueError("Either the number of requests or the duration must be given")
+        self.target = target
+        self.generator = generator
+        self.concurrency = concurrency
+        self.rate = rate
+        self.requests = requests
+        self.duration = duration
+        self.latencies = []
+        self.statuses = {}
+        self.errors = {}
+        self.sent = 0
+        # Set again when the test is run
+        self.started = time.perf_counter()
+
+    def should_send(self, now: float) -> bool:
+        if self.requests is not None and self.requests <= self.sent:
+            return False
+        return self.duration is None or now < self.started + self.duration
+
+    async def send(self, due: float):
+        kind, path, headers = self.generator.request()
+        try:
+            status, body = await self.target.get(path, headers)
+        except Exception as e:
+            error = type(e).__name__
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return
+        self.latencies.append(time.perf_counter() - due)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        reason = response_error(kind, status, body)
+        if reason is not None:
+            error = f"{kind}: {reason}"
+            self.errors[error] = self.errors.get(error, 0) + 1
+
+    async def closed_loop_client(self):
+        while self.should_send(time.perf_counter()):
+            self.sent += 1
+            await self.send(time.perf_counter())
+
+    async def open_loop(self):
+        interval = 1 / self.rate
+        tasks = set()
+        due = self.started
+        while self.should_send(due):
+            delay = due - time.perf_counter()
+            if 0 < delay:
+                await asyncio.sleep(delay)
+            self.sent += 1
+            task = asyncio.create_task(self.send(due))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            due += interval
+        if tasks:
+            await asyncio.wait(tasks)
+
+    async def run(self) -> dict:
+        self.started = time.perf_counter()
+        try:
+            if self.rate is None:
+                await asyncio.gather(
+                    *(self.closed_loop_client() for _ in range(self.concurrency))
+                )
+            else:
+                await self.open_loop()
+        finally:
+            await self.target.close()
+        return self.report(time.perf_counter() - self.started)
+
+    def report(self, elapsed: float) -> dict:
+        latencies = sorted(self.latencies)
+        errors = sum(self.errors.values())
+
+        def ms(value):
+            return None if value is None else value * 1000
+
+        return {
+            "mode": "closed" if self.rate is None else "open",
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "duration_s": elapsed,
+            "requests": self.sent,
+            "throughput_rps": len(latencies) / elapsed if elapsed else None,
+            "errors": errors,
+            "error_rate": errors / self.sent if self.sent else None,
+            "errors_by_kind": self.errors,
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "latency_ms": {
+                "mean": ms(sum(latencies) / len(latencies)) if latencies else None,
+                "p50": ms(percentile(latencies, 0.50)),
+                "p90": ms(percentile(latencies, 0.90)),
+                "p99": ms(percentile(latencies, 0.99)),
+                "p999": ms(percentile(latencies, 0.999)),
+                "max": ms(latencies[-1]) if latencies else None,
+            },
+        }
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parses a request mix such as "solvable=8,unsolvable=1" """
+    weights = {}
+    for item in mix.split(","):
+        kind, _, weight = item.partition("=")
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise ValueError(f"Unknown request kind '{kind}'")
+        weights[kind] = float(weight)
+    return weights
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m web.loadgen", description="Load test the /solve endpoint."
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument("--app", choices=("flask", "asgi"), help="Test the app in-process")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=None, help="Open loop, requests/sec")
+    parser.add_argument("--requests", type=int, default=None)
+    parser.add_argument("--duration", type=float, default=None, help="Seconds")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--max-capacity", type=int, default=100)
+    parser.add_argument(
+        "--distribution", choices=("uniform", "loguniform"), default="uniform"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", type=argparse.FileType("w"), default=sys.stdout)
+    args = parser.parse_args(argv)
+    if args.requests is None and args.duration is None:
+        parser.error("one of --requests or --duration is required")
+
+    async def run():
+        if args.url is not None:
+            load_target = HttpTarget(args.url, args.concurrency)
+        elif args.app == "asgi":
+            load_target = AsgiTarget()
+        else:
+            load_target = FlaskTarget()
+        generator = RequestGenerator(
+            parse_mix(args.mix), args.max_capacity, args.distribution, args.seed
+        )
+        load_test = LoadTest(
+            load_target,
+            generator,
+            args.concurrency,
+            rate=args.rate,
+            requests=args.requests,
+            duration=args.duration,
+        )
+        return await load_test.run()
+
+    report = asyncio.run(run())
+    json.dump(report, args.output, indent=2)
+    args.output.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,40 @@
-from flask import Flask, request, jsonify
+import dataclasses
+import io
+import json
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask, request, jsonify, stream_with_context
 from jug_riddle import JugRiddle, solve, UnsolvableRiddle
+from jug_riddle.batch import CSV, DEFAULT_CHUNK_SIZE, FORMATS, NDJSON, max_workers, solve_lines
+from jug_riddle.verifier import pack_json_actions, verify
+
+from .caching import SOLUTION_MAX_AGE, solution_etag
 
 app = Flask(__name__)
 
+# Worker processes for `/solve/batch`, shared by all requests (see `get_batch_executor`)
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def set_cache_headers(response, etag: str):
+    """Adds the cache validators and the caching policy to a `/solve` response."""
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = SOLUTION_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+def get_batch_executor() -> ProcessPoolExecutor:
+    """The app's pool of worker processes (one per CPU), created on first use"""
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ProcessPoolExecutor(max_workers=max_workers())
+        return _batch_executor
+
 
 @app.get("/solve")
 def solve_water_jug():
@@ -33,6 +65,9 @@ def solve_water_jug():
 
     If the riddle is unsolvable, the 'status' field will be 'Unsolvable'.
 
+    Responses carry a strong `ETag` and a long-lived `Cache-Control`. If the request has an
+    `If-None-Match` header matching the ETag, a `304 Not Modified` is returned without solving.
+
     Raises:
     - BadRequest: If the parameters are missing or not valid integers.
     """
@@ -44,6 +79,10 @@ def solve_water_jug():
     except Exception as e:
         return jsonify({"error": str(e)})
 
+    etag = solution_etag(jug1_capacity, jug2_capacity, goal)
+    if request.if_none_match.contains_weak(etag):
+        return set_cache_headers(app.response_class(status=304), etag)
+
     riddle = JugRiddle(jug1_capacity, jug2_capacity, goal)
     try:
         riddle = solve(riddle)
@@ -56,11 +95,117 @@ def solve_water_jug():
             ret.append({"jug": jug.value, "action": action.name})
         status = "Solved"
 
-    return jsonify({"response": ret, "status": status})
+    return set_cache_headers(jsonify({"response": ret, "status": status}), etag)
 
 
-def run_flask_app():
-    app.run(host="0.0.0.0", port=5000)
+@app.post("/solve/batch")
+def solve_water_jug_batch():
+    """
+    Batch solver for the Water Jug Riddle.
+
+    The request body has one riddle per line, either as NDJSON (default) or as CSV
+    (`Content-Type: text/csv` or `?format=csv`):
+
+        {"jug1_capacity": 4, "jug2_capacity": 3, "goal": 2}
+        [7, 4, 3]
+
+    or
+
+        jug1_capacity,jug2_capacity,goal
+        4,3,2
+
+    Optional query string parameters:
+    - format (str): "ndjson" or "csv", overrides the Content-Type.
+    - workers (int): How many workers of the app's pool (one process per CPU) this request may use at
+      once, clamped to [1, #CPUs]. Defaults to all of them.
+    - chunk_size (int): How many riddles are sent to a worker at once. Must be at least 1.
+
+    Returns:
+    - NDJSON response, streamed, with one result per riddle in input order. Each result has the
+      riddle inputs plus the same `response` and `status` fields as `/solve`, or an `error` field
+      if the line could not be parsed.
+    - 400 with an `error` if the query string is not valid.
+    """
+    lines = io.TextIOWrapper(request.stream, encoding="utf-8")
+    try:
+        fmt = request.args.get("format")
+        if fmt is None:
+            fmt = CSV if request.mimetype == "text/csv" else NDJSON
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'")
+        workers = request.args.get("workers", type=int)
+        chunk_size = request.args.get("chunk_size", DEFAULT_CHUNK_SIZE, type=int)
+        results = solve_lines(
+            lines, fmt, workers=workers, chunk_size=chunk_size, executor=get_batch_executor()
+        )
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
 
+    def generate():
+        for result in results:
+            yield json.dumps(result) + "\n"
 
+    return app.response_class(
+        stream_with_context(generate()), mimetype="application/x-ndjson"
+    )
 
+
+@app.post("/verify")
+def verify_water_jug_solution():
+    """
+    Verifies a solution to the Water Jug Riddle.
+
+    The riddle and the actions can be given as JSON, with the actions in the same format `/solve` returns:
+    {
+        "jug1_capacity": 3,
+        "jug2_capacity": 2,
+        "goal": 1,
+        "actions": [
+            {"jug": 1, "action": "FILL"},
+            {"jug": 1, "action": "TRANSFER"},
+            {"jug": 2, "action": "EMPTY"}
+        ]
+    }
+
+    Or packed (`Content-Type: application/octet-stream`), with the riddle in the query string and one byte
+    per action in the body: 0/1 fill jug 1/2, 2/3 empty jug 1/2 and 4/5 transfer from jug 1/2.
+
+    Returns:
+    - JSON response with the number of `steps`, whether they are `valid` and reach the goal (`solved`),
+      the `first_invalid_step` (1-based) and the `reason` if not, and whether the solution is `optimal`
+      compared with the `solver_steps` of the solver's solution. `solver_steps` is only counted for solutions
+      reaching the goal, and only up to their length: it is null otherwise (or if the solver has no solution).
+
+    Example:
+    POST /verify?jug1_capacity=3&jug2_capacity=2&goal=1 with body b"\\x00\\x04\\x03"
+
+    Response:
+    {
+        "steps": 3,
+        "valid": true,
+        "solved": true,
+        "first_invalid_step": null,
+        "reason": null,
+        "solver_steps": 3,
+        "optimal": true
+    }
+    """
+    try:
+        if request.mimetype == "application/octet-stream":
+            params = request.args
+            codes = request.get_data()
+        else:
+            params = request.get_json()
+            codes = pack_json_actions(params["actions"])
+        jug1_capacity = int(params.get("jug1_capacity"))
+        jug2_capacity = int(params.get("jug2_capacity"))
+        goal = int(params.get("goal"))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+
+    result = verify(jug1_capacity, jug2_capacity, goal, codes)
+    return jsonify(dataclasses.asdict(result))
+
+
+def run_flask_app():
+    app.run(host="0.0.0.0", port=5000)